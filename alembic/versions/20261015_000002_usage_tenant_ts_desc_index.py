@@ -0,0 +1,58 @@
+"""Covering (tenant_id, timestamp DESC) index for usage reads
+
+Revision ID: 20261015_000002
+Revises: 20241220_000001
+Create Date: 2026-10-15 00:00:02
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000002"
+down_revision: str | None = "20241220_000001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Newest-first tenant reads become index-only scans
+        op.create_index(
+            "idx_usage_tenant_ts_desc",
+            "token_usage_raw",
+            ["tenant_id", sa.text("timestamp DESC")],
+            postgresql_include=["provider", "model", "total_tokens", "calculated_cost"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+        # Redundant: tenant_id is the leading column of the composite indexes
+        op.drop_index(
+            "idx_usage_tenant_id",
+            table_name="token_usage_raw",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_usage_tenant_id",
+            "token_usage_raw",
+            ["tenant_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "idx_usage_tenant_ts_desc",
+            table_name="token_usage_raw",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
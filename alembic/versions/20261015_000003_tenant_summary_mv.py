@@ -0,0 +1,51 @@
+"""Tenant summary materialized view
+
+Revision ID: 20261015_000003
+Revises: 20261015_000002
+Create Date: 2026-10-15 00:00:03
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000003"
+down_revision: str | None = "20261015_000002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Per-(tenant, provider, model, cloud) rollup served by /tenant/{id}/summary
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_tenant_summary AS
+        SELECT
+            tenant_id,
+            provider,
+            model,
+            cloud_provider,
+            COUNT(*) AS total_requests,
+            SUM(prompt_tokens) AS total_prompt_tokens,
+            SUM(completion_tokens) AS total_completion_tokens,
+            SUM(total_tokens) AS total_tokens,
+            SUM(calculated_cost) AS total_cost,
+            MIN(timestamp) AS first_usage,
+            MAX(timestamp) AS last_usage,
+            now() AS last_refreshed_at
+        FROM token_usage_raw
+        GROUP BY tenant_id, provider, model, cloud_provider
+        """)
+
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        "uq_mv_tenant_summary",
+        "mv_tenant_summary",
+        ["tenant_id", "provider", "model", "cloud_provider"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_tenant_summary")
@@ -0,0 +1,92 @@
+"""Per-tenant aggregation watermarks
+
+Revision ID: 20261015_000004
+Revises: 20261015_000003
+Create Date: 2026-10-15 00:00:04
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000004"
+down_revision: str | None = "20261015_000003"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Create aggregation_watermark table
+    op.create_table(
+        "aggregation_watermark",
+        sa.Column("tenant_id", sa.String(255), nullable=False),
+        sa.Column("last_aggregated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("tenant_id"),
+    )
+
+    # Existing raw events must not be folded in again by the first incremental
+    # run. Seeding each tenant's watermark alone would also mark events the old
+    # daily job had not summarized yet (e.g. today's) as done, so the daily
+    # summaries are rebuilt from exactly the events the watermarks cover.
+    op.execute("""
+        INSERT INTO aggregation_watermark (tenant_id, last_aggregated_at)
+        SELECT tenant_id, MAX(created_at)
+        FROM token_usage_raw
+        GROUP BY tenant_id
+        """)
+    op.execute("DELETE FROM tenant_daily_summary")
+    op.execute("""
+        INSERT INTO tenant_daily_summary (
+            id, tenant_id, date, provider, model, cloud_provider,
+            total_requests, total_prompt_tokens, total_completion_tokens,
+            total_tokens, total_cost, avg_latency_ms
+        )
+        SELECT
+            gen_random_uuid(),
+            r.tenant_id,
+            DATE(r.timestamp),
+            r.provider,
+            r.model,
+            r.cloud_provider,
+            COUNT(r.id),
+            SUM(r.prompt_tokens),
+            SUM(r.completion_tokens),
+            SUM(r.total_tokens),
+            SUM(r.calculated_cost),
+            AVG(r.latency_ms)
+        FROM token_usage_raw r
+        JOIN aggregation_watermark w ON w.tenant_id = r.tenant_id
+        WHERE r.created_at <= w.last_aggregated_at
+        GROUP BY r.tenant_id, DATE(r.timestamp), r.provider, r.model, r.cloud_provider
+        """)
+
+    # Incremental aggregation scans raw events by ingestion time
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_usage_created_at",
+            "token_usage_raw",
+            ["created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_usage_created_at",
+            table_name="token_usage_raw",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_table("aggregation_watermark")
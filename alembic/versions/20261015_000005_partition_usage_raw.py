@@ -0,0 +1,147 @@
+"""Partition token_usage_raw by month
+
+Revision ID: 20261015_000005
+Revises: 20261015_000004
+Create Date: 2026-10-15 00:00:05
+
+"""
+
+from collections.abc import Sequence
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000005"
+down_revision: str | None = "20261015_000004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Months created ahead of the current one; the partition job keeps this topped up
+PREMAKE_MONTHS = 2
+
+
+def _next_month(month_start: datetime) -> datetime:
+    if month_start.month == 12:
+        return month_start.replace(year=month_start.year + 1, month=1)
+    return month_start.replace(month=month_start.month + 1)
+
+
+def _create_indexes() -> None:
+    op.create_index("idx_usage_provider", "token_usage_raw", ["provider"])
+    op.create_index("idx_usage_model", "token_usage_raw", ["model"])
+    op.create_index("idx_usage_timestamp", "token_usage_raw", ["timestamp"])
+    op.create_index("idx_usage_tenant_timestamp", "token_usage_raw", ["tenant_id", "timestamp"])
+    op.create_index(
+        "idx_usage_tenant_ts_desc",
+        "token_usage_raw",
+        ["tenant_id", sa.text("timestamp DESC")],
+        postgresql_include=["provider", "model", "total_tokens", "calculated_cost"],
+    )
+    op.create_index("idx_usage_provider_model", "token_usage_raw", ["provider", "model"])
+    op.create_index(
+        "idx_usage_cloud_instance", "token_usage_raw", ["cloud_provider", "instance_id"]
+    )
+    op.create_index("idx_usage_k8s", "token_usage_raw", ["k8s_namespace", "k8s_pod"])
+    op.create_index("idx_usage_created_at", "token_usage_raw", ["created_at"])
+
+
+def _create_tenant_summary_view() -> None:
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_tenant_summary AS
+        SELECT
+            tenant_id,
+            provider,
+            model,
+            cloud_provider,
+            COUNT(*) AS total_requests,
+            SUM(prompt_tokens) AS total_prompt_tokens,
+            SUM(completion_tokens) AS total_completion_tokens,
+            SUM(total_tokens) AS total_tokens,
+            SUM(calculated_cost) AS total_cost,
+            MIN(timestamp) AS first_usage,
+            MAX(timestamp) AS last_usage,
+            now() AS last_refreshed_at
+        FROM token_usage_raw
+        GROUP BY tenant_id, provider, model, cloud_provider
+        """)
+    op.create_index(
+        "uq_mv_tenant_summary",
+        "mv_tenant_summary",
+        ["tenant_id", "provider", "model", "cloud_provider"],
+        unique=True,
+    )
+
+
+def upgrade() -> None:
+    # The view depends on the table being replaced
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_tenant_summary")
+
+    op.execute("ALTER TABLE token_usage_raw RENAME TO token_usage_raw_unpartitioned")
+    op.execute("""
+        CREATE TABLE token_usage_raw (
+            LIKE token_usage_raw_unpartitioned INCLUDING DEFAULTS
+        ) PARTITION BY RANGE (timestamp)
+        """)
+
+    # One partition per UTC month from the oldest event through the premake horizon
+    oldest = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT date_trunc('month', min(timestamp) AT TIME ZONE 'UTC') "
+                "FROM token_usage_raw_unpartitioned"
+            )
+        )
+        .scalar()
+    )
+    current = datetime.now(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None
+    )
+    month_start = min(oldest, current) if oldest is not None else current
+    horizon = current
+    for _ in range(PREMAKE_MONTHS):
+        horizon = _next_month(horizon)
+
+    while month_start <= horizon:
+        month_end = _next_month(month_start)
+        op.execute(
+            f"CREATE TABLE token_usage_raw_p{month_start:%Y%m} "
+            f"PARTITION OF token_usage_raw "
+            f"FOR VALUES FROM ('{month_start:%Y-%m-%d} 00:00:00+00') "
+            f"TO ('{month_end:%Y-%m-%d} 00:00:00+00')"
+        )
+        month_start = month_end
+
+    op.execute("CREATE TABLE token_usage_raw_default PARTITION OF token_usage_raw DEFAULT")
+
+    op.execute("INSERT INTO token_usage_raw SELECT * FROM token_usage_raw_unpartitioned")
+    op.drop_table("token_usage_raw_unpartitioned")
+
+    # Unique constraints on a partitioned table must include the partition key
+    op.create_primary_key("token_usage_raw_pkey", "token_usage_raw", ["id", "timestamp"])
+    _create_indexes()
+
+    _create_tenant_summary_view()
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_tenant_summary")
+
+    op.execute("ALTER TABLE token_usage_raw RENAME TO token_usage_raw_partitioned")
+    op.execute("""
+        CREATE TABLE token_usage_raw (
+            LIKE token_usage_raw_partitioned INCLUDING DEFAULTS
+        )
+        """)
+    op.execute("INSERT INTO token_usage_raw SELECT * FROM token_usage_raw_partitioned")
+
+    # Dropping the parent drops every partition with it
+    op.drop_table("token_usage_raw_partitioned")
+
+    op.create_primary_key("token_usage_raw_pkey", "token_usage_raw", ["id"])
+    _create_indexes()
+
+    _create_tenant_summary_view()
@@ -0,0 +1,90 @@
+"""Integer cost columns in 1e-10 USD units
+
+Revision ID: 20261015_000006
+Revises: 20261015_000005
+Create Date: 2026-10-15 00:00:06
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000006"
+down_revision: str | None = "20261015_000005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, NUMERIC cost column, BIGINT 1e-10 USD column)
+COST_COLUMNS = [
+    ("token_usage_raw", "calculated_cost", "calculated_cost_e10"),
+    ("tenant_daily_summary", "total_cost", "total_cost_e10"),
+    ("tenant_monthly_summary", "total_cost", "total_cost_e10"),
+]
+
+
+def _create_tenant_summary_view(with_e10: bool) -> None:
+    e10_column = "SUM(calculated_cost_e10) AS total_cost_e10," if with_e10 else ""
+    op.execute(f"""
+        CREATE MATERIALIZED VIEW mv_tenant_summary AS
+        SELECT
+            tenant_id,
+            provider,
+            model,
+            cloud_provider,
+            COUNT(*) AS total_requests,
+            SUM(prompt_tokens) AS total_prompt_tokens,
+            SUM(completion_tokens) AS total_completion_tokens,
+            SUM(total_tokens) AS total_tokens,
+            SUM(calculated_cost) AS total_cost,
+            {e10_column}
+            MIN(timestamp) AS first_usage,
+            MAX(timestamp) AS last_usage,
+            now() AS last_refreshed_at
+        FROM token_usage_raw
+        GROUP BY tenant_id, provider, model, cloud_provider
+        """)
+    op.create_index(
+        "uq_mv_tenant_summary",
+        "mv_tenant_summary",
+        ["tenant_id", "provider", "model", "cloud_provider"],
+        unique=True,
+    )
+
+
+def upgrade() -> None:
+    # Add 1e-10 USD unit columns and backfill them from the NUMERIC costs
+    for table, cost_column, e10_column in COST_COLUMNS:
+        op.add_column(
+            table,
+            sa.Column(e10_column, sa.BigInteger(), server_default="0", nullable=False),
+        )
+        op.execute(f"UPDATE {table} SET {e10_column} = CAST({cost_column} * 10000000000 AS BIGINT)")
+
+    for side in ("input", "output"):
+        op.add_column(
+            "pricing_table",
+            sa.Column(
+                f"{side}_price_per_1k_e10",
+                sa.BigInteger(),
+                sa.Computed(f"CAST({side}_price_per_1k * 10000000000 AS BIGINT)", persisted=True),
+            ),
+        )
+
+    # Rebuild the tenant summary view with the integer cost sum
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_tenant_summary")
+    _create_tenant_summary_view(with_e10=True)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS mv_tenant_summary")
+    _create_tenant_summary_view(with_e10=False)
+
+    op.drop_column("pricing_table", "output_price_per_1k_e10")
+    op.drop_column("pricing_table", "input_price_per_1k_e10")
+
+    for table, _, e10_column in reversed(COST_COLUMNS):
+        op.drop_column(table, e10_column)
@@ -0,0 +1,48 @@
+"""Drop indexes covered by other indexes
+
+Revision ID: 20261015_000007
+Revises: 20261015_000006
+Create Date: 2026-10-15 00:00:07
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000007"
+down_revision: str | None = "20261015_000006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Summary indexes that are leading prefixes of the tables' unique constraints
+SUMMARY_INDEXES = [
+    ("idx_daily_tenant_date", "tenant_daily_summary", ["tenant_id", "date"]),
+    ("idx_monthly_tenant_period", "tenant_monthly_summary", ["tenant_id", "year", "month"]),
+]
+
+
+def upgrade() -> None:
+    # Covered by idx_usage_provider_model; partitioned tables cannot drop CONCURRENTLY
+    op.drop_index("idx_usage_provider", table_name="token_usage_raw", if_exists=True)
+    # Same keys as idx_usage_tenant_ts_desc, which btree scans in either direction
+    op.drop_index("idx_usage_tenant_timestamp", table_name="token_usage_raw", if_exists=True)
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in SUMMARY_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUMMARY_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+    op.create_index(
+        "idx_usage_tenant_timestamp",
+        "token_usage_raw",
+        ["tenant_id", "timestamp"],
+        if_not_exists=True,
+    )
+    op.create_index("idx_usage_provider", "token_usage_raw", ["provider"], if_not_exists=True)
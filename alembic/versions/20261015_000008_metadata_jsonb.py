@@ -0,0 +1,53 @@
+"""Store usage metadata as JSONB
+
+Revision ID: 20261015_000008
+Revises: 20261015_000007
+Create Date: 2026-10-15 00:00:08
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000008"
+down_revision: str | None = "20261015_000007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "token_usage_raw",
+        "metadata_json",
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        existing_nullable=True,
+        postgresql_using="metadata_json::jsonb",
+    )
+
+    # jsonb_path_ops supports containment (@>) lookups at a fraction of the default size;
+    # partitioned tables cannot build indexes CONCURRENTLY
+    op.create_index(
+        "idx_usage_meta_gin",
+        "token_usage_raw",
+        ["metadata_json"],
+        postgresql_using="gin",
+        postgresql_ops={"metadata_json": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_usage_meta_gin", table_name="token_usage_raw")
+    op.alter_column(
+        "token_usage_raw",
+        "metadata_json",
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="metadata_json::text",
+    )
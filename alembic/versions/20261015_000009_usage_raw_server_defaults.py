@@ -0,0 +1,50 @@
+"""Server-side defaults for raw usage columns
+
+Revision ID: 20261015_000009
+Revises: 20261015_000008
+Create Date: 2026-10-15 00:00:09
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261015_000009"
+down_revision: str | None = "20261015_000008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # COPY bypasses ORM defaults; let the database fill omitted columns
+    op.alter_column(
+        "token_usage_raw",
+        "id",
+        existing_type=sa.UUID(),
+        server_default=sa.text("gen_random_uuid()"),
+    )
+    op.alter_column(
+        "token_usage_raw",
+        "calculated_cost",
+        existing_type=sa.Numeric(20, 10),
+        server_default="0",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "token_usage_raw",
+        "calculated_cost",
+        existing_type=sa.Numeric(20, 10),
+        server_default=None,
+    )
+    op.alter_column(
+        "token_usage_raw",
+        "id",
+        existing_type=sa.UUID(),
+        server_default=None,
+    )
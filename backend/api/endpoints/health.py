@@ -5,7 +5,7 @@ Liveness and readiness probes for Kubernetes.
 """
 
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,6 +17,8 @@ router = APIRouter()
 class HealthResponse(BaseModel):
     """Health check response."""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str
     version: str
 
@@ -24,6 +26,8 @@ class HealthResponse(BaseModel):
 class ReadinessResponse(BaseModel):
     """Readiness check response."""
 
+    model_config = ConfigDict(frozen=True)
+
     status: str
     database: str
     version: str
@@ -4,16 +4,47 @@ Provider Endpoints
 API endpoints for provider information and pricing.
 """
 
+from functools import lru_cache
+from typing import Final
+
 import structlog
-from fastapi import APIRouter, HTTPException, status
+from anyio import to_thread
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
-from backend.core.pricing import get_pricing_engine
+from backend.core.pricing import PROVIDER_ALIASES, get_pricing_engine
 from backend.schemas.usage import ModelPricing, ProviderModelsResponse
 
 router = APIRouter()
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
+
+# Canonical provider keys, i.e. the targets of the pricing alias map
+VALID_PROVIDERS: Final[frozenset[str]] = frozenset(PROVIDER_ALIASES.values())
+
+_INVALID_PROVIDER_DETAIL: Final[str] = (
+    f"Invalid provider. Must be one of: {', '.join(sorted(VALID_PROVIDERS))}"
+)
 
-VALID_PROVIDERS = {"bedrock", "azure_openai", "gemini"}
+
+@lru_cache(maxsize=2 * len(VALID_PROVIDERS))
+def _models_body(etag: str, provider: str) -> bytes:
+    """
+    Serialized models response for a provider under one pricing version.
+
+    Keyed by the pricing ETag, so a reload misses the cache and rebuilds.
+    """
+    models = get_pricing_engine().get_provider_models(provider)
+    return (
+        ProviderModelsResponse(
+            provider=provider,
+            models=[ModelPricing(**m) for m in models],
+        )
+        .model_dump_json()
+        .encode()
+    )
+
+
+# Pricing only changes on reload, so clients may reuse responses briefly
+_MODELS_CACHE_CONTROL: Final[str] = "public, max-age=60"
 
 
 @router.get(
@@ -22,7 +53,10 @@ VALID_PROVIDERS = {"bedrock", "azure_openai", "gemini"}
     summary="Get provider models",
     description="Get available models and pricing for a provider",
 )
-async def get_provider_models(provider: str) -> ProviderModelsResponse:
+async def get_provider_models(
+    provider: str,
+    request: Request,
+) -> Response:
     """
     Get available models and their pricing for a provider.
 
@@ -30,27 +64,30 @@ async def get_provider_models(provider: str) -> ProviderModelsResponse:
     - bedrock (AWS Bedrock)
     - azure_openai (Azure OpenAI)
     - gemini (Google Gemini)
+
+    Responses carry an ETag of the loaded pricing configuration; a matching
+    ``If-None-Match`` gets ``304 Not Modified`` without a body. Bodies are
+    serialized once per pricing version and served as bytes.
     """
     if provider not in VALID_PROVIDERS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid provider. Must be one of: {', '.join(VALID_PROVIDERS)}",
+            detail=_INVALID_PROVIDER_DETAIL,
         )
 
     try:
         pricing_engine = get_pricing_engine()
-        models = pricing_engine.get_provider_models(provider)
+        etag = f'"{pricing_engine.etag}"'
+        cache_headers = {"ETag": etag, "Cache-Control": _MODELS_CACHE_CONTROL}
 
-        return ProviderModelsResponse(
-            provider=provider,
-            models=[
-                ModelPricing(
-                    model=m["model"],
-                    input_price_per_1k=m["input_price_per_1k"],
-                    output_price_per_1k=m["output_price_per_1k"],
-                )
-                for m in models
-            ],
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+        return Response(
+            content=_models_body(pricing_engine.etag, provider),
+            media_type="application/json",
+            headers=cache_headers,
         )
     except Exception as e:
         logger.error("Failed to get provider models", provider=provider, error=str(e))
@@ -73,7 +110,7 @@ async def reload_pricing() -> dict[str, str]:
     """
     try:
         pricing_engine = get_pricing_engine()
-        pricing_engine.reload()
+        await to_thread.run_sync(pricing_engine.reload)
         return {"status": "ok", "message": "Pricing configuration reloaded"}
     except Exception as e:
         logger.error("Failed to reload pricing", error=str(e))
@@ -4,13 +4,16 @@ Tenant Endpoints
 API endpoints for tenant usage reports and summaries.
 """
 
-from datetime import date
-from typing import Annotated
+import time
+from datetime import date, timedelta
+from typing import Annotated, Any, Final
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.config import settings
 from backend.database import get_session
 from backend.schemas.usage import (
     DailySummaryResponse,
@@ -20,7 +23,30 @@ from backend.schemas.usage import (
 from backend.services.usage import UsageService
 
 router = APIRouter()
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
+
+# Daily/monthly summaries only change when the aggregation jobs run, so each
+# worker reuses recent responses for settings.summary_cache_ttl seconds
+_SUMMARY_CACHE_SIZE: Final[int] = 1024
+_summary_cache: dict[tuple[Any, ...], tuple[float, BaseModel]] = {}
+
+
+def _get_cached(key: tuple[Any, ...]) -> Any | None:
+    """Return a cached summary response that has not expired yet."""
+    entry = _summary_cache.get(key)
+    if entry is None or entry[0] < time.monotonic():
+        return None
+    return entry[1]
+
+
+def _set_cached(key: tuple[Any, ...], response: BaseModel) -> None:
+    """Cache a summary response, evicting the oldest entry when full."""
+    if settings.summary_cache_ttl <= 0:
+        return
+    _summary_cache.pop(key, None)
+    if len(_summary_cache) >= _SUMMARY_CACHE_SIZE:
+        del _summary_cache[next(iter(_summary_cache))]
+    _summary_cache[key] = (time.monotonic() + settings.summary_cache_ttl, response)
 
 
 @router.get(
@@ -69,9 +95,17 @@ async def get_daily_summary(
 
     Defaults to last 30 days if no date range specified.
     """
+    # Resolved here so the cache key is the actual range, which rolls over daily
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=30)
+
+    key = ("daily", tenant_id, start_date, end_date)
+    if (cached := _get_cached(key)) is not None:
+        return cached
+
     try:
         service = UsageService(session)
-        return await service.get_daily_summary(tenant_id, start_date, end_date)
+        result = await service.get_daily_summary(tenant_id, start_date, end_date)
     except Exception as e:
         logger.error("Failed to get daily summary", tenant_id=tenant_id, error=str(e))
         raise HTTPException(
@@ -79,6 +113,9 @@ async def get_daily_summary(
             detail="Failed to retrieve daily summary",
         ) from e
 
+    _set_cached(key, result)
+    return result
+
 
 @router.get(
     "/{tenant_id}/monthly",
@@ -97,12 +134,19 @@ async def get_monthly_summary(
 
     Optionally filter by year and/or month.
     """
+    key = ("monthly", tenant_id, year, month)
+    if (cached := _get_cached(key)) is not None:
+        return cached
+
     try:
         service = UsageService(session)
-        return await service.get_monthly_summary(tenant_id, year, month)
+        result = await service.get_monthly_summary(tenant_id, year, month)
     except Exception as e:
         logger.error("Failed to get monthly summary", tenant_id=tenant_id, error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve monthly summary",
         ) from e
+
+    _set_cached(key, result)
+    return result
@@ -7,7 +7,9 @@ API endpoints for recording token usage events.
 from typing import Annotated
 
 import structlog
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.database import get_session
@@ -15,20 +17,27 @@ from backend.schemas.usage import UsageEvent, UsageEventResponse
 from backend.services.usage import UsageService
 
 router = APIRouter()
-logger = structlog.get_logger()
+# Per-endpoint loggers; context is bound once per process, on first use
+_record_log = structlog.get_logger(module=__name__, endpoint="record_usage")
+_batch_log = structlog.get_logger(module=__name__, endpoint="record_usage_batch")
+
+# Validates batch bodies straight from the raw JSON bytes
+_BATCH_ADAPTER = TypeAdapter(list[UsageEvent])
+# Builds and serializes batch responses in pydantic-core, bypassing response_model
+_BATCH_RESPONSE_ADAPTER = TypeAdapter(list[UsageEventResponse])
 
 
 @router.post(
     "",
-    response_model=UsageEventResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": UsageEventResponse}},
     summary="Record token usage",
     description="Record a token usage event from the SDK",
 )
 async def record_usage(
     event: UsageEvent,
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> UsageEventResponse:
+) -> Response:
     """
     Record a token usage event.
 
@@ -37,12 +46,15 @@ async def record_usage(
     - Auto-detects the source (K8s, EC2, GCE, Azure VM)
     - Calculates the cost based on model pricing
     - Stores the event in the database
+
+    The stored row was validated at ingress, so the response model is built
+    without revalidation and serialized directly.
     """
     try:
         service = UsageService(session)
         usage = await service.record_usage(event)
 
-        return UsageEventResponse(
+        response = UsageEventResponse.model_construct(
             id=usage.id,
             tenant_id=usage.tenant_id,
             provider=usage.provider,
@@ -51,14 +63,19 @@ async def record_usage(
             calculated_cost=usage.calculated_cost,
             timestamp=usage.timestamp,
         )
+        return Response(
+            content=response.model_dump_json(),
+            status_code=status.HTTP_201_CREATED,
+            media_type="application/json",
+        )
     except ValueError as e:
-        logger.warning("Invalid usage event", error=str(e))
+        _record_log.warning("Invalid usage event", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         ) from e
     except Exception as e:
-        logger.error("Failed to record usage", error=str(e))
+        _record_log.error("Failed to record usage", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to record usage event",
@@ -67,20 +84,41 @@ async def record_usage(
 
 @router.post(
     "/batch",
-    response_model=list[UsageEventResponse],
     status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_201_CREATED: {"model": list[UsageEventResponse]}},
     summary="Record multiple usage events",
     description="Record multiple token usage events in a single request",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _BATCH_ADAPTER.json_schema()}},
+        }
+    },
 )
 async def record_usage_batch(
-    events: list[UsageEvent],
+    request: Request,
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> list[UsageEventResponse]:
+) -> Response:
     """
     Record multiple token usage events in batch.
 
     Useful for SDKs that queue events locally and send them periodically.
+    The body is validated directly from JSON bytes, without building an
+    intermediate list of dicts first, and the response is serialized to
+    JSON bytes in one pass rather than through ``response_model``.
+
+    Events are written in bulk. If the bulk write fails, they are recorded
+    one by one and failing events are skipped, so the response lists only
+    the events that were stored.
     """
+    try:
+        events = _BATCH_ADAPTER.validate_json(await request.body())
+    except ValidationError as e:
+        # Same 422 shape FastAPI produces for declared body parameters
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        ) from e
+
     if len(events) > 1000:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -88,24 +126,22 @@ async def record_usage_batch(
         )
 
     service = UsageService(session)
-    results = []
-
-    for event in events:
-        try:
-            usage = await service.record_usage(event)
-            results.append(
-                UsageEventResponse(
-                    id=usage.id,
-                    tenant_id=usage.tenant_id,
-                    provider=usage.provider,
-                    model=usage.model,
-                    total_tokens=usage.total_tokens,
-                    calculated_cost=usage.calculated_cost,
-                    timestamp=usage.timestamp,
-                )
-            )
-        except Exception as e:
-            logger.warning("Failed to record event in batch", error=str(e))
-            continue
-
-    return results
+    try:
+        # Savepoint, so a failed bulk write leaves the session usable for the fallback
+        async with session.begin_nested():
+            rows = await service.record_usage_many(events)
+    except Exception as e:
+        _batch_log.warning("Bulk insert failed, recording events one by one", error=str(e))
+        rows = await service.record_usage_each(events)
+        if not rows:
+            _batch_log.error("Failed to record usage batch", count=len(events), error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to record usage events",
+            ) from e
+
+    return Response(
+        content=_BATCH_RESPONSE_ADAPTER.dump_json(_BATCH_RESPONSE_ADAPTER.validate_python(rows)),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/json",
+    )
@@ -4,17 +4,45 @@ Token Cost Engine
 Multi-cloud pricing calculations for AWS Bedrock, Azure OpenAI, and Google Gemini.
 """
 
+import hashlib
+from collections.abc import Sequence
 from decimal import Decimal
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Final
 
+import numpy as np
 import structlog
 import yaml
 
 from backend.config import settings
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
+
+# Maximum number of memoized (provider, model) lookups
+_RESOLVE_CACHE_SIZE = 2048
+
+_COST_QUANTUM = Decimal("0.0000000001")
+
+# Returned as-is for events without tokens; same scale as computed costs
+_ZERO_COST = Decimal(0).quantize(_COST_QUANTUM)
+
+# Costs are also stored as integers in 1e-10 USD units, the scale of NUMERIC(20, 10)
+E10_PER_USD: Final[int] = 10**10
+
+# Accepted provider spellings mapped to their pricing config keys
+PROVIDER_ALIASES: Final[dict[str, str]] = {
+    "bedrock": "bedrock",
+    "aws_bedrock": "bedrock",
+    "azure_openai": "azure_openai",
+    "azure": "azure_openai",
+    "gemini": "gemini",
+    "google": "gemini",
+    "google_gemini": "gemini",
+}
+
+# Prefer the libyaml-backed loader; PyYAML builds without libyaml lack it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 class PricingEngine:
@@ -27,24 +55,58 @@ class PricingEngine:
     def __init__(self, config_path: str | None = None):
         self.config_path = config_path or settings.pricing_config_path
         self._pricing_data: dict[str, Any] = {}
+        self._provider_models: dict[str, list[dict[str, Any]]] = {}
+        self.etag = ""
+        self._resolve = lru_cache(maxsize=_RESOLVE_CACHE_SIZE)(self._resolve_pricing)
+        self._get_rates = lru_cache(maxsize=_RESOLVE_CACHE_SIZE)(self._compute_rates)
+        self._get_multiplier = lru_cache(maxsize=_RESOLVE_CACHE_SIZE)(
+            self._compute_discount_multiplier
+        )
         self._load_pricing()
 
     def _load_pricing(self) -> None:
-        """Load pricing configuration from YAML file."""
+        """
+        Load pricing configuration from YAML file.
+
+        The new configuration is parsed before the current one is replaced,
+        so a reload running in a worker thread never exposes a half-loaded
+        engine to requests on the event loop.
+        """
         config_file = Path(self.config_path)
 
         if not config_file.exists():
             logger.warning("Pricing config not found, using defaults", path=self.config_path)
-            self._pricing_data = self._get_default_pricing()
-            return
-
-        try:
-            with open(config_file) as f:
-                self._pricing_data = yaml.safe_load(f)
-            logger.info("Loaded pricing configuration", path=self.config_path)
-        except Exception as e:
-            logger.error("Failed to load pricing config", error=str(e))
-            self._pricing_data = self._get_default_pricing()
+            pricing_data = self._get_default_pricing()
+        else:
+            try:
+                with open(config_file) as f:
+                    pricing_data = yaml.load(f, Loader=_YAML_LOADER)
+                logger.info("Loaded pricing configuration", path=self.config_path)
+            except Exception as e:
+                logger.error("Failed to load pricing config", error=str(e))
+                pricing_data = self._get_default_pricing()
+
+        provider_models = self._build_provider_models(pricing_data)
+
+        self._pricing_data = pricing_data
+        self._provider_models = provider_models
+        # Changes only when the loaded configuration does; used for HTTP caching
+        self.etag = hashlib.blake2b(repr(pricing_data).encode(), digest_size=8).hexdigest()
+        self._resolve.cache_clear()
+        self._get_rates.cache_clear()
+        self._get_multiplier.cache_clear()
+        self._warm_rate_cache()
+
+    def _warm_rate_cache(self) -> None:
+        """Precompute per-token float rates for every configured model."""
+        for provider_key, provider_pricing in self._pricing_data.items():
+            if not isinstance(provider_pricing, dict) or provider_key in (
+                "defaults",
+                "tenant_overrides",
+            ):
+                continue
+            for model in provider_pricing:
+                self._get_rates(provider_key, model)
 
     def _get_default_pricing(self) -> dict[str, Any]:
         """Return default pricing if config file is missing."""
@@ -71,6 +133,10 @@ class PricingEngine:
         Returns:
             Tuple of (input_price_per_1k, output_price_per_1k)
         """
+        return self._resolve(provider, model)
+
+    def _resolve_pricing(self, provider: str, model: str) -> tuple[Decimal, Decimal]:
+        """Resolve model pricing (memoized per instance via ``self._resolve``)."""
         # Map provider names to config keys
         provider_key = self._normalize_provider(provider)
 
@@ -101,16 +167,8 @@ class PricingEngine:
 
     def _normalize_provider(self, provider: str) -> str:
         """Normalize provider name to config key."""
-        mapping = {
-            "bedrock": "bedrock",
-            "aws_bedrock": "bedrock",
-            "azure_openai": "azure_openai",
-            "azure": "azure_openai",
-            "gemini": "gemini",
-            "google": "gemini",
-            "google_gemini": "gemini",
-        }
-        return mapping.get(provider.lower(), provider.lower())
+        provider = provider.lower()
+        return PROVIDER_ALIASES.get(provider, provider)
 
     def calculate_cost(
         self,
@@ -133,21 +191,110 @@ class PricingEngine:
         Returns:
             Calculated cost in USD
         """
-        input_price, output_price = self.get_model_pricing(provider, model)
+        if not (prompt_tokens or completion_tokens):
+            return _ZERO_COST
 
-        # Apply tenant discount if configured
-        discount = self._get_tenant_discount(tenant_id) if tenant_id else Decimal("0")
+        input_rate, output_rate = self._get_rates(provider, model)
 
         # Calculate raw cost
-        input_cost = (Decimal(prompt_tokens) / Decimal("1000")) * input_price
-        output_cost = (Decimal(completion_tokens) / Decimal("1000")) * output_price
-        total_cost = input_cost + output_cost
+        total_cost = prompt_tokens * input_rate + completion_tokens * output_rate
 
-        # Apply discount
-        if discount > 0:
-            total_cost = total_cost * (Decimal("1") - discount / Decimal("100"))
+        # Apply tenant discount if configured
+        if tenant_id:
+            total_cost *= self._get_multiplier(tenant_id)
+
+        return Decimal(repr(total_cost)).quantize(_COST_QUANTUM)
+
+    def _compute_rates(self, provider: str, model: str) -> tuple[float, float]:
+        """
+        Compute per-token (input, output) float rates for a model.
 
-        return total_cost.quantize(Decimal("0.0000000001"))
+        Memoized per instance via ``self._get_rates``.
+        """
+        input_price, output_price = self._resolve(provider, model)
+        return (float(input_price) / 1000.0, float(output_price) / 1000.0)
+
+    def get_rate_table(self, keys: list[tuple[str, str, str | None]]) -> np.ndarray:
+        """
+        Build the rate table consumed by ``calculate_cost_batch``.
+
+        Args:
+            keys: Distinct (provider, model, tenant_id) combinations
+
+        Returns:
+            Array of shape (len(keys), 3); row i holds the per-token input
+            rate, per-token output rate and discount multiplier for keys[i]
+        """
+        rates = np.empty((len(keys), 3), dtype=np.float64)
+        for i, (provider, model, tenant_id) in enumerate(keys):
+            input_rate, output_rate = self._get_rates(provider, model)
+            multiplier = self._get_multiplier(tenant_id) if tenant_id else 1.0
+            rates[i] = (input_rate, output_rate, multiplier)
+        return rates
+
+    @staticmethod
+    def calculate_cost_batch(
+        prompt: np.ndarray,
+        completion: np.ndarray,
+        rate_idx: np.ndarray,
+        rates: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Vectorized ``calculate_cost`` for many events at once.
+
+        Args:
+            prompt: Prompt token counts (float64)
+            completion: Completion token counts (float64)
+            rate_idx: Row of ``rates`` to apply to each event
+            rates: Rate table from ``get_rate_table``
+
+        Returns:
+            Unrounded cost in USD per event
+        """
+        table = rates[rate_idx]
+        return (prompt * table[:, 0] + completion * table[:, 1]) * table[:, 2]
+
+    def calculate_cost_many(
+        self,
+        items: Sequence[tuple[str, str, int, int, str | None]],
+    ) -> list[Decimal]:
+        """
+        ``calculate_cost`` for many events, priced in one vectorized pass.
+
+        Each distinct (provider, model, tenant_id) is resolved once; the float
+        arithmetic matches ``calculate_cost`` operation for operation, so the
+        results are identical.
+
+        Args:
+            items: (provider, model, prompt_tokens, completion_tokens, tenant_id)
+                per event
+
+        Returns:
+            Calculated cost in USD per event
+        """
+        keys: dict[tuple[str, str, str | None], int] = {}
+        rate_idx = np.fromiter(
+            (keys.setdefault((item[0], item[1], item[4]), len(keys)) for item in items),
+            dtype=np.intp,
+            count=len(items),
+        )
+        prompt = np.fromiter((item[2] for item in items), dtype=np.float64, count=len(items))
+        completion = np.fromiter((item[3] for item in items), dtype=np.float64, count=len(items))
+
+        costs = self.calculate_cost_batch(
+            prompt, completion, rate_idx, self.get_rate_table(list(keys))
+        )
+        # tolist() yields Python floats, whose repr matches the scalar path
+        return [Decimal(repr(cost)).quantize(_COST_QUANTUM) for cost in costs.tolist()]
+
+    def _compute_discount_multiplier(self, tenant_id: str) -> float:
+        """
+        Compute the cost multiplier for a tenant's discount (1.0 if none).
+
+        Memoized per instance via ``self._get_multiplier``.
+        """
+        discount = float(self._get_tenant_discount(tenant_id))
+        return 1.0 - discount / 100.0 if discount > 0 else 1.0
 
     def _get_tenant_discount(self, tenant_id: str) -> Decimal:
         """Get discount percentage for a tenant."""
@@ -184,21 +331,38 @@ class PricingEngine:
 
     def get_provider_models(self, provider: str) -> list[dict[str, Any]]:
         """Get all available models and their pricing for a provider."""
-        provider_key = self._normalize_provider(provider)
-        provider_pricing = self._pricing_data.get(provider_key, {})
-
-        models = []
-        for model, pricing in provider_pricing.items():
-            if isinstance(pricing, dict) and "input_per_1k" in pricing:
-                models.append(
-                    {
-                        "model": model,
-                        "input_price_per_1k": Decimal(str(pricing["input_per_1k"])),
-                        "output_price_per_1k": Decimal(str(pricing["output_per_1k"])),
-                    }
-                )
-
-        return sorted(models, key=lambda x: x["model"])
+        return list(self._provider_models.get(self._normalize_provider(provider), ()))
+
+    @staticmethod
+    def _build_provider_models(
+        pricing_data: dict[str, Any],
+    ) -> dict[str, list[dict[str, Any]]]:
+        """Build the sorted model listings for every provider, once per load."""
+        provider_models = {}
+        for provider_key, provider_pricing in pricing_data.items():
+            if not isinstance(provider_pricing, dict):
+                continue
+            models = [
+                {
+                    "model": model,
+                    "input_price_per_1k": Decimal(str(pricing["input_per_1k"])),
+                    "output_price_per_1k": Decimal(str(pricing["output_per_1k"])),
+                }
+                for model, pricing in provider_pricing.items()
+                if isinstance(pricing, dict) and "input_per_1k" in pricing
+            ]
+            provider_models[provider_key] = sorted(models, key=lambda x: x["model"])
+        return provider_models
+
+
+def cost_to_e10(cost: Decimal) -> int:
+    """Convert a USD cost to integer 1e-10 USD units."""
+    return int(cost.quantize(_COST_QUANTUM).scaleb(10))
+
+
+def e10_to_cost(units: int) -> Decimal:
+    """Convert integer 1e-10 USD units to a USD cost."""
+    return Decimal(units).scaleb(-10)
 
 
 @lru_cache
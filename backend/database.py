@@ -7,24 +7,46 @@ Async SQLAlchemy database session management.
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
 
 from backend.config import settings
 
+
+def _json_serializer(obj: object) -> str:
+    """Encode JSON/JSONB column values with orjson."""
+    return orjson.dumps(obj).decode()
+
+
 # Create async engine
 engine = create_async_engine(
     str(settings.database_url),
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_timeout=settings.database_pool_timeout,
+    pool_recycle=settings.database_pool_recycle,
+    echo=settings.app_debug,
+    pool_pre_ping=False,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
+)
+
+# Background jobs are short-lived and infrequent; NullPool keeps them from
+# holding connections that the API pool could use
+job_engine = create_async_engine(
+    str(settings.database_url),
     echo=settings.app_debug,
-    pool_pre_ping=True,
+    poolclass=NullPool,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
-# Create session factory
+# Create session factories
 async_session_factory = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -33,6 +55,14 @@ async_session_factory = async_sessionmaker(
     autoflush=False,
 )
 
+job_session_factory = async_sessionmaker(
+    job_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -54,9 +84,9 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
     """
     Context manager for database session outside of FastAPI routes.
-    Used by background jobs and schedulers.
+    Used by background jobs and schedulers; connections are not pooled.
     """
-    async with async_session_factory() as session:
+    async with job_session_factory() as session:
         try:
             yield session
             await session.commit()
@@ -77,3 +107,4 @@ async def init_db() -> None:
 async def close_db() -> None:
     """Close database connection pool."""
     await engine.dispose()
+    await job_engine.dispose()
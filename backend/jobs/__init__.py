@@ -4,7 +4,20 @@ Background Jobs
 Scheduled jobs for aggregation and reporting.
 """
 
-from backend.jobs.aggregation import DailyAggregationJob, MonthlyAggregationJob
+from backend.jobs.aggregation import (
+    DailyAggregationJob,
+    MonthlyAggregationJob,
+    TenantSummaryRefreshJob,
+)
+from backend.jobs.costs import CostRecalculationJob
+from backend.jobs.partitions import UsagePartitionJob
 from backend.jobs.reports import BillingReportJob
 
-__all__ = ["DailyAggregationJob", "MonthlyAggregationJob", "BillingReportJob"]
+__all__ = [
+    "DailyAggregationJob",
+    "MonthlyAggregationJob",
+    "TenantSummaryRefreshJob",
+    "UsagePartitionJob",
+    "CostRecalculationJob",
+    "BillingReportJob",
+]
@@ -4,21 +4,94 @@ Aggregation Jobs
 Daily and monthly token usage aggregation jobs.
 """
 
-from datetime import date, timedelta
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from functools import cache
+from typing import Any
 
 import structlog
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Select,
+    bindparam,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import Insert
 from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.config import settings
 from backend.database import get_session_context
 from backend.models.usage import (
+    AggregationWatermark,
     TenantDailySummary,
     TenantMonthlySummary,
     TokenUsageRaw,
 )
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
+
+# Incremental runs only consume events ingested at least this long ago
+_WATERMARK_LAG = timedelta(minutes=5)
+
+_DAILY_METRICS = (
+    "total_requests",
+    "total_prompt_tokens",
+    "total_completion_tokens",
+    "total_tokens",
+    "total_cost",
+    "total_cost_e10",
+    "avg_latency_ms",
+)
+
+_MONTHLY_METRICS = (
+    "total_requests",
+    "total_prompt_tokens",
+    "total_completion_tokens",
+    "total_tokens",
+    "total_cost",
+    "total_cost_e10",
+)
+
+_DAILY_COLUMNS = [
+    "id",
+    "tenant_id",
+    "date",
+    "provider",
+    "model",
+    "cloud_provider",
+    *_DAILY_METRICS,
+]
+
+_MONTHLY_COLUMNS = [
+    "id",
+    "tenant_id",
+    "year",
+    "month",
+    "provider",
+    "model",
+    *_MONTHLY_METRICS,
+]
+
+
+def _metrics_changed(
+    model: type[TenantDailySummary] | type[TenantMonthlySummary],
+    excluded: Any,
+    metrics: tuple[str, ...],
+) -> ColumnElement[bool]:
+    """
+    Upsert guard that skips rewriting summary rows whose metrics are unchanged.
+
+    Re-running a recompute then produces no dead tuples, index updates or
+    WAL for the rows it leaves as they were.
+    """
+    return or_(*(getattr(model, col).is_distinct_from(excluded[col]) for col in metrics))
 
 
 class DailyAggregationJob:
@@ -26,104 +99,278 @@ class DailyAggregationJob:
     Aggregate raw token usage into daily summaries.
 
     Runs daily to pre-compute usage statistics for fast dashboard queries.
+    Aggregation happens server-side (``INSERT ... SELECT ... ON CONFLICT``),
+    so raw rows never cross the wire.
     """
 
     async def run(self, target_date: date | None = None) -> int:
         """
-        Run daily aggregation for a specific date.
+        Run daily aggregation.
+
+        Without a date, raw events ingested since each tenant's watermark are
+        added onto the existing daily summaries. With a date, that day is
+        recomputed from raw events already covered by the watermarks.
 
         Args:
-            target_date: Date to aggregate (defaults to yesterday)
+            target_date: Date to recompute (incremental run if omitted)
 
         Returns:
             Number of summary records created/updated
         """
         if target_date is None:
-            target_date = date.today() - timedelta(days=1)
+            return await self._run_incremental()
 
-        logger.info("Starting daily aggregation", date=str(target_date))
+        log = logger.bind(job="daily_aggregation", date=target_date.isoformat())
+        log.info("Starting daily aggregation")
 
         async with get_session_context() as session:
-            # Get aggregated data from raw events
-            stmt = (
-                select(
-                    TokenUsageRaw.tenant_id,
-                    TokenUsageRaw.provider,
-                    TokenUsageRaw.model,
-                    TokenUsageRaw.cloud_provider,
-                    func.count(TokenUsageRaw.id).label("total_requests"),
-                    func.sum(TokenUsageRaw.prompt_tokens).label("total_prompt_tokens"),
-                    func.sum(TokenUsageRaw.completion_tokens).label("total_completion_tokens"),
-                    func.sum(TokenUsageRaw.total_tokens).label("total_tokens"),
-                    func.sum(TokenUsageRaw.calculated_cost).label("total_cost"),
-                    func.avg(TokenUsageRaw.latency_ms).label("avg_latency_ms"),
-                )
-                .where(func.date(TokenUsageRaw.timestamp) == target_date)
-                .group_by(
-                    TokenUsageRaw.tenant_id,
-                    TokenUsageRaw.provider,
-                    TokenUsageRaw.model,
-                    TokenUsageRaw.cloud_provider,
+            count = await self._recompute_day(session, target_date)
+
+            await session.commit()
+            log.info("Daily aggregation completed", records=count)
+            return count
+
+    async def _recompute_day(self, session: AsyncSession, target_date: date) -> int:
+        """
+        Recompute one day's summaries from watermarked raw events.
+
+        Runs in the caller's transaction; the caller commits.
+        """
+        day_start = datetime.combine(target_date, time.min, timezone.utc)
+        result = await session.execute(
+            self._recompute_day_stmt(),
+            {"day_start": day_start, "day_end": day_start + timedelta(days=1)},
+        )
+        return result.rowcount
+
+    @classmethod
+    @cache
+    def _recompute_day_stmt(cls) -> Insert:
+        """
+        Build the day recompute upsert once per process.
+
+        The day bounds are bind parameters, so every run reuses the same
+        construct and its compiled form from the engine's statement cache.
+        """
+        # Half-open range keeps the timestamp index and partition pruning usable
+        source = cls._aggregate_select(
+            TokenUsageRaw.timestamp >= bindparam("day_start", type_=DateTime(timezone=True)),
+            TokenUsageRaw.timestamp < bindparam("day_end", type_=DateTime(timezone=True)),
+            TokenUsageRaw.created_at <= AggregationWatermark.last_aggregated_at,
+        )
+        # Core insert against the table: with an ORM entity, executing it with a
+        # parameter dict would be taken for an ORM bulk INSERT of that dict
+        stmt = pg_insert(TenantDailySummary.__table__).from_select(_DAILY_COLUMNS, source)
+        return stmt.on_conflict_do_update(
+            constraint="uq_daily_summary",
+            set_={
+                **{col: stmt.excluded[col] for col in _DAILY_METRICS},
+                "updated_at": func.now(),
+            },
+            where=_metrics_changed(TenantDailySummary, stmt.excluded, _DAILY_METRICS),
+        )
+
+    async def _run_incremental(self) -> int:
+        """
+        Fold newly ingested raw events into daily summaries.
+
+        Pending events are processed in ``settings.aggregation_chunk_days``
+        slices of ingestion time, each committed in its own short
+        transaction, so a large backlog never turns into one long write.
+        """
+        # Leave room for in-flight transactions whose created_at is already set
+        high_water = datetime.now(timezone.utc) - _WATERMARK_LAG
+
+        async with get_session_context() as session:
+            pending_from = (
+                await session.execute(
+                    select(func.min(TokenUsageRaw.created_at))
+                    .select_from(TokenUsageRaw)
+                    .outerjoin(
+                        AggregationWatermark,
+                        AggregationWatermark.tenant_id == TokenUsageRaw.tenant_id,
+                    )
+                    .where(*self._pending(high_water))
                 )
+            ).scalar()
+
+        if pending_from is None:
+            logger.info("No new data to aggregate", high_water=high_water.isoformat())
+            return 0
+
+        logger.info(
+            "Starting incremental daily aggregation",
+            pending_from=pending_from.isoformat(),
+            high_water=high_water.isoformat(),
+        )
+
+        chunk = timedelta(days=settings.aggregation_chunk_days)
+        total = 0
+        lower: datetime | None = None
+        upper = pending_from
+
+        while upper < high_water:
+            upper = min(upper + chunk, high_water)
+            total += await self._aggregate_increment(lower, upper)
+            lower = upper
+
+        logger.info("Incremental daily aggregation completed", records=total)
+        return total
+
+    async def _aggregate_increment(self, lower: datetime | None, upper: datetime) -> int:
+        """
+        Fold events ingested in ``(lower, upper]`` into daily summaries.
+
+        Metrics of new events are added to the existing summary rows, and each
+        tenant's watermark is advanced to ``upper`` in the same transaction.
+        """
+        window = list(self._pending(upper))
+        if lower is not None:
+            window.append(TokenUsageRaw.created_at > lower)
+
+        async with get_session_context() as session:
+            source = self._aggregate_select(*window)
+            stmt = pg_insert(TenantDailySummary).from_select(_DAILY_COLUMNS, source)
+            excluded = stmt.excluded
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_daily_summary",
+                set_={
+                    "total_requests": TenantDailySummary.total_requests + excluded.total_requests,
+                    "total_prompt_tokens": (
+                        TenantDailySummary.total_prompt_tokens + excluded.total_prompt_tokens
+                    ),
+                    "total_completion_tokens": (
+                        TenantDailySummary.total_completion_tokens
+                        + excluded.total_completion_tokens
+                    ),
+                    "total_tokens": TenantDailySummary.total_tokens + excluded.total_tokens,
+                    "total_cost": TenantDailySummary.total_cost + excluded.total_cost,
+                    "total_cost_e10": TenantDailySummary.total_cost_e10 + excluded.total_cost_e10,
+                    # Request-weighted mean of the old and new averages
+                    "avg_latency_ms": func.coalesce(
+                        (
+                            TenantDailySummary.avg_latency_ms * TenantDailySummary.total_requests
+                            + excluded.avg_latency_ms * excluded.total_requests
+                        )
+                        / (TenantDailySummary.total_requests + excluded.total_requests),
+                        excluded.avg_latency_ms,
+                        TenantDailySummary.avg_latency_ms,
+                    ),
+                    "updated_at": func.now(),
+                },
             )
 
             result = await session.execute(stmt)
-            rows = result.all()
+            count = result.rowcount
 
-            if not rows:
-                logger.info("No data to aggregate", date=str(target_date))
-                return 0
-
-            # Upsert daily summaries
-            count = 0
-            for row in rows:
-                upsert_stmt = (
-                    pg_insert(TenantDailySummary)
-                    .values(
-                        tenant_id=row.tenant_id,
-                        date=target_date,
-                        provider=row.provider,
-                        model=row.model,
-                        cloud_provider=row.cloud_provider,
-                        total_requests=row.total_requests,
-                        total_prompt_tokens=row.total_prompt_tokens or 0,
-                        total_completion_tokens=row.total_completion_tokens or 0,
-                        total_tokens=row.total_tokens or 0,
-                        total_cost=row.total_cost or Decimal("0"),
-                        avg_latency_ms=int(row.avg_latency_ms) if row.avg_latency_ms else None,
-                    )
-                    .on_conflict_do_update(
-                        constraint="uq_daily_summary",
-                        set_={
-                            "total_requests": row.total_requests,
-                            "total_prompt_tokens": row.total_prompt_tokens or 0,
-                            "total_completion_tokens": row.total_completion_tokens or 0,
-                            "total_tokens": row.total_tokens or 0,
-                            "total_cost": row.total_cost or Decimal("0"),
-                            "avg_latency_ms": (
-                                int(row.avg_latency_ms) if row.avg_latency_ms else None
-                            ),
-                        },
-                    )
+            # Advance watermarks for every tenant that had new events
+            tenants = (
+                select(
+                    TokenUsageRaw.tenant_id,
+                    literal(upper, type_=DateTime(timezone=True)),
+                )
+                .select_from(TokenUsageRaw)
+                .outerjoin(
+                    AggregationWatermark,
+                    AggregationWatermark.tenant_id == TokenUsageRaw.tenant_id,
                 )
-                await session.execute(upsert_stmt)
-                count += 1
+                .where(*window)
+                .distinct()
+            )
+            watermark_stmt = pg_insert(AggregationWatermark).from_select(
+                ["tenant_id", "last_aggregated_at"], tenants
+            )
+            watermark_stmt = watermark_stmt.on_conflict_do_update(
+                index_elements=["tenant_id"],
+                set_={
+                    "last_aggregated_at": watermark_stmt.excluded.last_aggregated_at,
+                    "updated_at": func.now(),
+                },
+            )
+            await session.execute(watermark_stmt)
 
             await session.commit()
-            logger.info("Daily aggregation completed", date=str(target_date), records=count)
+            logger.debug("Aggregated ingestion window", upper=upper.isoformat(), records=count)
             return count
 
+    @staticmethod
+    def _pending(high_water: datetime) -> tuple[ColumnElement[bool], ...]:
+        """Filter for raw events past their tenant's watermark, up to ``high_water``."""
+        return (
+            or_(
+                AggregationWatermark.last_aggregated_at.is_(None),
+                TokenUsageRaw.created_at > AggregationWatermark.last_aggregated_at,
+            ),
+            TokenUsageRaw.created_at <= high_water,
+        )
+
+    @staticmethod
+    def _aggregate_select(*conditions: ColumnElement[bool]) -> Select[Any]:
+        """
+        Build the raw-event aggregation feeding ``tenant_daily_summary``.
+
+        Columns are ordered as ``_DAILY_COLUMNS``.
+        """
+        event_date = func.date(TokenUsageRaw.timestamp)
+        return (
+            select(
+                func.gen_random_uuid(),
+                TokenUsageRaw.tenant_id,
+                event_date,
+                TokenUsageRaw.provider,
+                TokenUsageRaw.model,
+                TokenUsageRaw.cloud_provider,
+                func.count(TokenUsageRaw.id),
+                func.coalesce(func.sum(TokenUsageRaw.prompt_tokens), 0),
+                func.coalesce(func.sum(TokenUsageRaw.completion_tokens), 0),
+                func.coalesce(func.sum(TokenUsageRaw.total_tokens), 0),
+                func.coalesce(func.sum(TokenUsageRaw.calculated_cost), Decimal("0")),
+                func.coalesce(func.sum(TokenUsageRaw.calculated_cost_e10), 0),
+                func.avg(TokenUsageRaw.latency_ms),
+            )
+            .select_from(TokenUsageRaw)
+            .outerjoin(
+                AggregationWatermark,
+                AggregationWatermark.tenant_id == TokenUsageRaw.tenant_id,
+            )
+            .where(*conditions)
+            .group_by(
+                TokenUsageRaw.tenant_id,
+                event_date,
+                TokenUsageRaw.provider,
+                TokenUsageRaw.model,
+                TokenUsageRaw.cloud_provider,
+            )
+        )
+
     async def backfill(self, start_date: date, end_date: date) -> int:
         """
         Backfill daily aggregations for a date range.
+
+        Days are independent, so ``settings.aggregation_backfill_concurrency``
+        workers share them out. Each worker keeps one session for all of its
+        days and commits once; every day runs in its own savepoint, so a
+        failing day is logged and skipped without losing the others.
         """
-        total = 0
-        current = start_date
+        days = iter(
+            [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+        )
+
+        async def worker() -> int:
+            count = 0
+            async with get_session_context() as session:
+                for day in days:
+                    try:
+                        async with session.begin_nested():
+                            count += await self._recompute_day(session, day)
+                    except Exception as e:
+                        logger.error("Backfill day failed", date=day.isoformat(), error=str(e))
+            return count
 
-        while current <= end_date:
-            count = await self.run(current)
-            total += count
-            current += timedelta(days=1)
+        counts = await asyncio.gather(
+            *(worker() for _ in range(settings.aggregation_backfill_concurrency))
+        )
+        total = sum(counts)
 
         logger.info("Backfill completed", start=str(start_date), end=str(end_date), total=total)
         return total
@@ -159,7 +406,8 @@ class MonthlyAggregationJob:
             year = last_month.year
             month = last_month.month
 
-        logger.info("Starting monthly aggregation", year=year, month=month)
+        log = logger.bind(job="monthly_aggregation", year=year, month=month)
+        log.info("Starting monthly aggregation")
 
         async with get_session_context() as session:
             # Get first and last day of the month
@@ -169,19 +417,19 @@ class MonthlyAggregationJob:
             else:
                 last_day = date(year, month + 1, 1) - timedelta(days=1)
 
-            # Aggregate from daily summaries
-            stmt = (
+            # Aggregate from daily summaries and upsert server-side
+            source = (
                 select(
+                    func.gen_random_uuid(),
                     TenantDailySummary.tenant_id,
+                    literal(year),
+                    literal(month),
                     TenantDailySummary.provider,
                     TenantDailySummary.model,
-                    func.sum(TenantDailySummary.total_requests).label("total_requests"),
-                    func.sum(TenantDailySummary.total_prompt_tokens).label("total_prompt_tokens"),
-                    func.sum(TenantDailySummary.total_completion_tokens).label(
-                        "total_completion_tokens"
+                    *(
+                        func.coalesce(func.sum(getattr(TenantDailySummary, col)), 0)
+                        for col in _MONTHLY_METRICS
                     ),
-                    func.sum(TenantDailySummary.total_tokens).label("total_tokens"),
-                    func.sum(TenantDailySummary.total_cost).label("total_cost"),
                 )
                 .where(
                     TenantDailySummary.date >= first_day,
@@ -193,45 +441,42 @@ class MonthlyAggregationJob:
                     TenantDailySummary.model,
                 )
             )
+            stmt = pg_insert(TenantMonthlySummary).from_select(_MONTHLY_COLUMNS, source)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_monthly_summary",
+                set_={
+                    **{col: stmt.excluded[col] for col in _MONTHLY_METRICS},
+                    "updated_at": func.now(),
+                },
+                where=_metrics_changed(TenantMonthlySummary, stmt.excluded, _MONTHLY_METRICS),
+            )
 
             result = await session.execute(stmt)
-            rows = result.all()
+            count = result.rowcount
 
-            if not rows:
-                logger.info("No data to aggregate", year=year, month=month)
-                return 0
+            await session.commit()
 
-            # Upsert monthly summaries
-            count = 0
-            for row in rows:
-                upsert_stmt = (
-                    pg_insert(TenantMonthlySummary)
-                    .values(
-                        tenant_id=row.tenant_id,
-                        year=year,
-                        month=month,
-                        provider=row.provider,
-                        model=row.model,
-                        total_requests=row.total_requests or 0,
-                        total_prompt_tokens=row.total_prompt_tokens or 0,
-                        total_completion_tokens=row.total_completion_tokens or 0,
-                        total_tokens=row.total_tokens or 0,
-                        total_cost=row.total_cost or Decimal("0"),
-                    )
-                    .on_conflict_do_update(
-                        constraint="uq_monthly_summary",
-                        set_={
-                            "total_requests": row.total_requests or 0,
-                            "total_prompt_tokens": row.total_prompt_tokens or 0,
-                            "total_completion_tokens": row.total_completion_tokens or 0,
-                            "total_tokens": row.total_tokens or 0,
-                            "total_cost": row.total_cost or Decimal("0"),
-                        },
-                    )
-                )
-                await session.execute(upsert_stmt)
-                count += 1
+            if not count:
+                log.info("No summaries changed")
+                return 0
 
-            await session.commit()
-            logger.info("Monthly aggregation completed", year=year, month=month, records=count)
+            log.info("Monthly aggregation completed", records=count)
             return count
+
+
+class TenantSummaryRefreshJob:
+    """
+    Refresh the tenant summary materialized view.
+
+    Runs every ``settings.mv_refresh_seconds`` so /tenant/{id}/summary reads
+    a precomputed rollup instead of aggregating raw events per request.
+    """
+
+    async def run(self) -> None:
+        """Refresh ``mv_tenant_summary`` without blocking concurrent readers."""
+        logger.info("Refreshing tenant summary view")
+
+        async with get_session_context() as session:
+            await session.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_tenant_summary"))
+
+        logger.info("Tenant summary view refreshed")
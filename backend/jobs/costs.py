@@ -0,0 +1,131 @@
+"""
+Cost Recalculation Jobs
+=======================
+Reprice historical token usage after a pricing change.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+import numpy as np
+import structlog
+from sqlalchemy import BigInteger, Numeric, cast, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+
+from backend.core.pricing import E10_PER_USD, get_pricing_engine
+from backend.database import get_session_context
+from backend.models.usage import TokenUsageRaw
+
+logger = structlog.get_logger(module=__name__)
+
+# Rows per chunk; two bind parameters per row stays under asyncpg's 32767 limit
+_RECALC_CHUNK_SIZE = 10_000
+
+
+class CostRecalculationJob:
+    """
+    Recompute ``calculated_cost`` for raw usage events.
+
+    Events are read in keyset-paginated chunks, priced with NumPy in one
+    vectorized expression per chunk and written back with a single
+    ``UPDATE ... FROM (VALUES ...)``. Daily and monthly summaries for the
+    affected range must be recomputed afterwards
+    (``DailyAggregationJob.backfill``, ``MonthlyAggregationJob.run``).
+    """
+
+    async def run(
+        self,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> int:
+        """
+        Reprice events with timestamps in ``[start_date, end_date]``.
+
+        Args:
+            start_date: First day to reprice (unbounded if omitted)
+            end_date: Last day to reprice (unbounded if omitted)
+
+        Returns:
+            Number of events repriced
+        """
+        pricing = get_pricing_engine()
+
+        conditions = []
+        if start_date:
+            conditions.append(
+                TokenUsageRaw.timestamp >= datetime.combine(start_date, time.min, timezone.utc)
+            )
+        if end_date:
+            conditions.append(
+                TokenUsageRaw.timestamp
+                < datetime.combine(end_date + timedelta(days=1), time.min, timezone.utc)
+            )
+
+        logger.info("Starting cost recalculation", start=str(start_date), end=str(end_date))
+
+        total = 0
+        last_id = None
+
+        while True:
+            stmt = (
+                select(
+                    TokenUsageRaw.id,
+                    TokenUsageRaw.tenant_id,
+                    TokenUsageRaw.provider,
+                    TokenUsageRaw.model,
+                    TokenUsageRaw.prompt_tokens,
+                    TokenUsageRaw.completion_tokens,
+                )
+                .where(*conditions)
+                .order_by(TokenUsageRaw.id)
+                .limit(_RECALC_CHUNK_SIZE)
+            )
+            if last_id is not None:
+                stmt = stmt.where(TokenUsageRaw.id > last_id)
+
+            async with get_session_context() as session:
+                rows = (await session.execute(stmt)).all()
+                if not rows:
+                    break
+
+                # Factorize (provider, model, tenant) so each combination is priced once
+                keys: dict[tuple[str, str, str], int] = {}
+                rate_idx = np.fromiter(
+                    (keys.setdefault((r.provider, r.model, r.tenant_id), len(keys)) for r in rows),
+                    dtype=np.intp,
+                    count=len(rows),
+                )
+                prompt = np.fromiter(
+                    (r.prompt_tokens for r in rows), dtype=np.float64, count=len(rows)
+                )
+                completion = np.fromiter(
+                    (r.completion_tokens for r in rows), dtype=np.float64, count=len(rows)
+                )
+
+                costs = pricing.calculate_cost_batch(
+                    prompt, completion, rate_idx, pricing.get_rate_table(list(keys))
+                )
+                units = np.rint(costs * E10_PER_USD).astype(np.int64)
+
+                new_costs = values(
+                    column("id", PGUUID(as_uuid=True)),
+                    column("e10", BigInteger),
+                    name="new_costs",
+                ).data(list(zip([r.id for r in rows], units.tolist(), strict=True)))
+
+                await session.execute(
+                    update(TokenUsageRaw)
+                    .where(TokenUsageRaw.id == new_costs.c.id)
+                    .values(
+                        calculated_cost_e10=new_costs.c.e10,
+                        calculated_cost=cast(new_costs.c.e10, Numeric(20, 10)) / E10_PER_USD,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+
+            total += len(rows)
+            last_id = rows[-1].id
+            logger.debug("Repriced usage chunk", records=total)
+
+        logger.info("Cost recalculation completed", records=total)
+        return total
@@ -0,0 +1,75 @@
+"""
+Partition Jobs
+==============
+Maintenance of the monthly ``token_usage_raw`` partitions.
+"""
+
+from datetime import date, datetime, timezone
+
+import structlog
+from sqlalchemy import text
+
+from backend.config import settings
+from backend.database import get_session_context
+
+logger = structlog.get_logger(module=__name__)
+
+
+def _next_month(month_start: date) -> date:
+    if month_start.month == 12:
+        return date(month_start.year + 1, 1, 1)
+    return date(month_start.year, month_start.month + 1, 1)
+
+
+class UsagePartitionJob:
+    """
+    Pre-create monthly partitions of ``token_usage_raw``.
+
+    Partitions must exist before events for that month arrive: once the
+    default partition holds rows for a month, that month's partition can
+    no longer be attached without moving them first. Each month is created
+    in its own savepoint, so such a month is logged and skipped without
+    losing the others.
+    """
+
+    async def run(self, months_ahead: int | None = None) -> list[str]:
+        """
+        Ensure partitions exist for the current month and the months ahead.
+
+        Args:
+            months_ahead: Months to create beyond the current one
+                (defaults to ``settings.partition_premake_months``)
+
+        Returns:
+            Names of the partitions ensured
+        """
+        if months_ahead is None:
+            months_ahead = settings.partition_premake_months
+
+        month_start = datetime.now(timezone.utc).date().replace(day=1)
+        ensured: list[str] = []
+
+        async with get_session_context() as session:
+            for _ in range(months_ahead + 1):
+                month_end = _next_month(month_start)
+                name = f"token_usage_raw_p{month_start:%Y%m}"
+                try:
+                    async with session.begin_nested():
+                        await session.execute(
+                            text(
+                                f"CREATE TABLE IF NOT EXISTS {name} "
+                                f"PARTITION OF token_usage_raw "
+                                f"FOR VALUES FROM ('{month_start.isoformat()} 00:00:00+00') "
+                                f"TO ('{month_end.isoformat()} 00:00:00+00')"
+                            )
+                        )
+                    ensured.append(name)
+                except Exception as e:
+                    # Typically the default partition already holds rows for this month
+                    logger.error("Usage partition skipped", partition=name, error=str(e))
+                month_start = month_end
+
+            await session.commit()
+
+        logger.info("Usage partitions ensured", partitions=ensured)
+        return ensured
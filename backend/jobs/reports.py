@@ -4,17 +4,38 @@ Billing Reports
 Generate CSV billing reports for tenants.
 """
 
+import asyncio
 import csv
 from datetime import datetime
 from pathlib import Path
 
 import structlog
-from sqlalchemy import select
+from anyio import to_thread
+from sqlalchemy import func, select, tuple_
 
+from backend.config import settings
+from backend.core.pricing import E10_PER_USD
 from backend.database import get_session_context
 from backend.models.usage import TenantMonthlySummary
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
+
+# Rows fetched per round trip when streaming report queries
+_STREAM_BATCH_SIZE = 1000
+
+# Write buffer for report files; batches output into 1 MiB write(2) calls
+_CSV_BUFFER_SIZE = 1 << 20
+
+
+def _format_cost(cost_e10: int) -> str:
+    """
+    Format an integer cost in 1e-10 USD units as fixed-point USD with 10 decimals.
+
+    Pure integer arithmetic: no Decimal allocation per row, and no float
+    rounding for large totals.
+    """
+    dollars, fraction = divmod(cost_e10, E10_PER_USD)
+    return f"{dollars}.{fraction:010d}"
 
 
 class BillingReportJob:
@@ -51,13 +72,27 @@ class BillingReportJob:
         )
 
         async with get_session_context() as session:
-            stmt = select(TenantMonthlySummary).where(
+            filters = [
                 TenantMonthlySummary.year == year,
                 TenantMonthlySummary.month == month,
-            )
+            ]
 
             if tenant_id:
-                stmt = stmt.where(TenantMonthlySummary.tenant_id == tenant_id)
+                filters.append(TenantMonthlySummary.tenant_id == tenant_id)
+
+            # Plain column rows; the report never needs hydrated entities
+            stmt = select(
+                TenantMonthlySummary.tenant_id,
+                TenantMonthlySummary.year,
+                TenantMonthlySummary.month,
+                TenantMonthlySummary.provider,
+                TenantMonthlySummary.model,
+                TenantMonthlySummary.total_requests,
+                TenantMonthlySummary.total_prompt_tokens,
+                TenantMonthlySummary.total_completion_tokens,
+                TenantMonthlySummary.total_tokens,
+                TenantMonthlySummary.total_cost_e10,
+            ).where(*filters)
 
             stmt = stmt.order_by(
                 TenantMonthlySummary.tenant_id,
@@ -65,9 +100,6 @@ class BillingReportJob:
                 TenantMonthlySummary.model,
             )
 
-            result = await session.execute(stmt)
-            rows = result.scalars().all()
-
             # Generate filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             if tenant_id:
@@ -77,8 +109,14 @@ class BillingReportJob:
 
             output_path = self.output_dir / filename
 
+            # Stream rows from a server-side cursor straight into the CSV
+            result = await session.stream(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+            record_count = 0
+
             # Write CSV
-            with open(output_path, "w", newline="") as f:
+            with open(
+                output_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE
+            ) as f:
                 writer = csv.writer(f)
 
                 # Header
@@ -98,27 +136,28 @@ class BillingReportJob:
                 )
 
                 # Data rows
-                for row in rows:
-                    writer.writerow(
-                        [
-                            row.tenant_id,
-                            row.year,
-                            row.month,
-                            row.provider,
-                            row.model,
-                            row.total_requests,
-                            row.total_prompt_tokens,
-                            row.total_completion_tokens,
-                            row.total_tokens,
-                            f"{row.total_cost:.10f}",
-                        ]
+                async for partition in result.partitions():
+                    # Columns are selected in CSV order; only the trailing cost is
+                    # reformatted. Formatting and writing run off the event loop.
+                    await to_thread.run_sync(
+                        writer.writerows,
+                        ((*row[:-1], _format_cost(row.total_cost_e10)) for row in partition),
                     )
-
-                # Summary row if multiple tenants
-                if not tenant_id and rows:
-                    total_requests = sum(r.total_requests for r in rows)
-                    total_tokens = sum(r.total_tokens for r in rows)
-                    total_cost = sum(r.total_cost for r in rows)
+                    record_count += len(partition)
+
+                # Summary row if multiple tenants, totalled by the database
+                if not tenant_id and record_count:
+                    totals = (
+                        await session.execute(
+                            select(
+                                func.sum(TenantMonthlySummary.total_requests),
+                                func.sum(TenantMonthlySummary.total_tokens),
+                                func.sum(TenantMonthlySummary.total_cost_e10),
+                            ).where(*filters)
+                        )
+                    ).one()
+                    # SUM(bigint) comes back as NUMERIC
+                    total_requests, total_tokens, total_cost = totals
 
                     writer.writerow([])
                     writer.writerow(
@@ -132,17 +171,54 @@ class BillingReportJob:
                             "-",
                             "-",
                             total_tokens,
-                            f"{total_cost:.10f}",
+                            _format_cost(int(total_cost)),
                         ]
                     )
 
             logger.info(
                 "Billing report generated",
                 path=str(output_path),
-                records=len(rows),
+                records=record_count,
             )
             return output_path
 
+    async def generate_tenant_reports(self, year: int, month: int) -> list[Path]:
+        """
+        Generate one monthly billing report per tenant.
+
+        Tenants are written concurrently, each in its own session, up to
+        ``settings.report_concurrency`` at a time.
+
+        Returns:
+            Paths to the generated CSV files
+        """
+        async with get_session_context() as session:
+            tenants = (
+                await session.scalars(
+                    select(TenantMonthlySummary.tenant_id)
+                    .where(
+                        TenantMonthlySummary.year == year,
+                        TenantMonthlySummary.month == month,
+                    )
+                    .distinct()
+                )
+            ).all()
+
+        logger.info(
+            "Generating per-tenant billing reports",
+            year=year,
+            month=month,
+            tenants=len(tenants),
+        )
+
+        semaphore = asyncio.Semaphore(settings.report_concurrency)
+
+        async def generate(tenant_id: str) -> Path:
+            async with semaphore:
+                return await self.generate_monthly_report(year, month, tenant_id=tenant_id)
+
+        return list(await asyncio.gather(*(generate(tenant_id) for tenant_id in tenants)))
+
     async def generate_tenant_summary_report(
         self,
         tenant_id: str,
@@ -161,23 +237,23 @@ class BillingReportJob:
         )
 
         async with get_session_context() as session:
-            stmt = select(TenantMonthlySummary).where(
+            stmt = select(
+                TenantMonthlySummary.year,
+                TenantMonthlySummary.month,
+                TenantMonthlySummary.provider,
+                TenantMonthlySummary.model,
+                TenantMonthlySummary.total_requests,
+                TenantMonthlySummary.total_tokens,
+                TenantMonthlySummary.total_cost_e10,
+            ).where(
                 TenantMonthlySummary.tenant_id == tenant_id,
             )
 
-            # Filter by date range
-            stmt = stmt.where(
-                (TenantMonthlySummary.year > start_year)
-                | (
-                    (TenantMonthlySummary.year == start_year)
-                    & (TenantMonthlySummary.month >= start_month)
-                )
-            )
+            # Filter by date range; a row-wise compare is an index range on
+            # (tenant_id, year, month) of uq_monthly_summary
             stmt = stmt.where(
-                (TenantMonthlySummary.year < end_year)
-                | (
-                    (TenantMonthlySummary.year == end_year)
-                    & (TenantMonthlySummary.month <= end_month)
+                tuple_(TenantMonthlySummary.year, TenantMonthlySummary.month).between(
+                    (start_year, start_month), (end_year, end_month)
                 )
             )
 
@@ -187,16 +263,18 @@ class BillingReportJob:
                 TenantMonthlySummary.provider,
             )
 
-            result = await session.execute(stmt)
-            rows = result.scalars().all()
-
             # Generate filename
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"summary_{tenant_id}_{start_year}{start_month:02d}_to_{end_year}{end_month:02d}_{timestamp}.csv"
             output_path = self.output_dir / filename
 
+            result = await session.stream(stmt.execution_options(yield_per=_STREAM_BATCH_SIZE))
+            record_count = 0
+
             # Write CSV
-            with open(output_path, "w", newline="") as f:
+            with open(
+                output_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE
+            ) as f:
                 writer = csv.writer(f)
 
                 writer.writerow(
@@ -211,22 +289,18 @@ class BillingReportJob:
                     ]
                 )
 
-                for row in rows:
-                    writer.writerow(
-                        [
-                            row.year,
-                            row.month,
-                            row.provider,
-                            row.model,
-                            row.total_requests,
-                            row.total_tokens,
-                            f"{row.total_cost:.10f}",
-                        ]
+                async for partition in result.partitions():
+                    # Columns are selected in CSV order; only the trailing cost is
+                    # reformatted. Formatting and writing run off the event loop.
+                    await to_thread.run_sync(
+                        writer.writerows,
+                        ((*row[:-1], _format_cost(row.total_cost_e10)) for row in partition),
                     )
+                    record_count += len(partition)
 
             logger.info(
                 "Tenant summary report generated",
                 path=str(output_path),
-                records=len(rows),
+                records=record_count,
             )
             return output_path
@@ -5,17 +5,23 @@ APScheduler-based job scheduler for aggregation and reporting.
 """
 
 import asyncio
-from datetime import date
+from datetime import date, datetime
 
 import structlog
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 from backend.config import settings
-from backend.jobs.aggregation import DailyAggregationJob, MonthlyAggregationJob
+from backend.jobs.aggregation import (
+    DailyAggregationJob,
+    MonthlyAggregationJob,
+    TenantSummaryRefreshJob,
+)
+from backend.jobs.partitions import UsagePartitionJob
 from backend.jobs.reports import BillingReportJob
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
 
 
 class JobScheduler:
@@ -27,6 +33,8 @@ class JobScheduler:
         self.scheduler = AsyncIOScheduler()
         self.daily_job = DailyAggregationJob()
         self.monthly_job = MonthlyAggregationJob()
+        self.summary_refresh_job = TenantSummaryRefreshJob()
+        self.partition_job = UsagePartitionJob()
         self.report_job = BillingReportJob()
 
     async def run_daily_aggregation(self) -> None:
@@ -47,6 +55,20 @@ class JobScheduler:
         except Exception as e:
             logger.error("Monthly aggregation failed", error=str(e))
 
+    async def run_summary_refresh(self) -> None:
+        """Execute tenant summary view refresh."""
+        try:
+            await self.summary_refresh_job.run()
+        except Exception as e:
+            logger.error("Tenant summary refresh failed", error=str(e))
+
+    async def run_partition_maintenance(self) -> None:
+        """Pre-create upcoming usage partitions."""
+        try:
+            await self.partition_job.run()
+        except Exception as e:
+            logger.error("Usage partition maintenance failed", error=str(e))
+
     async def run_monthly_reports(self) -> None:
         """Generate monthly billing reports."""
         try:
@@ -87,6 +109,27 @@ class JobScheduler:
             replace_existing=True,
         )
 
+        # Tenant summary view refresh - runs every configured interval (default 5 min)
+        self.scheduler.add_job(
+            self.run_summary_refresh,
+            IntervalTrigger(seconds=settings.mv_refresh_seconds),
+            id="summary_refresh",
+            name="Tenant Summary View Refresh",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+        # Usage partitions - runs at startup and on the 20th of each month at 1 AM
+        self.scheduler.add_job(
+            self.run_partition_maintenance,
+            CronTrigger(day=20, hour=1, minute=0),
+            id="partition_maintenance",
+            name="Usage Partition Maintenance",
+            replace_existing=True,
+            next_run_time=datetime.now(),
+        )
+
         # Monthly reports - runs on 2nd of month at 4 AM
         self.scheduler.add_job(
             self.run_monthly_reports,
@@ -100,6 +143,7 @@ class JobScheduler:
             "Scheduler configured",
             daily_hour=settings.daily_aggregation_hour,
             monthly_day=settings.monthly_aggregation_day,
+            mv_refresh_seconds=settings.mv_refresh_seconds,
         )
 
     def start(self) -> None:
@@ -6,16 +6,34 @@ FastAPI application entry point.
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from typing import Any
 
+import orjson
 import structlog
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
 
 from backend.api import api_router
 from backend.config import settings
+from backend.core.pricing import get_pricing_engine
 from backend.database import close_db, init_db
 
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """JSONRenderer serializer; the stdlib logger factory expects str."""
+    return orjson.dumps(obj, **kwargs).decode()
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (FastAPI's ORJSONResponse is deprecated)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -27,7 +45,7 @@ structlog.configure(
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
         (
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
             if settings.log_format == "json"
             else structlog.dev.ConsoleRenderer()
         ),
@@ -38,7 +56,7 @@ structlog.configure(
     cache_logger_on_first_use=True,
 )
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
 
 
 @asynccontextmanager
@@ -49,6 +67,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
     logger.info("Database connected")
 
+    # Parse pricing config in a worker thread rather than on the first request
+    await to_thread.run_sync(get_pricing_engine)
+    logger.info("Pricing engine loaded")
+
     yield
 
     # Shutdown
@@ -65,6 +87,7 @@ app = FastAPI(
     docs_url="/docs" if not settings.is_production else None,
     redoc_url="/redoc" if not settings.is_production else None,
     lifespan=lifespan,
+    default_response_class=_ORJSONResponse,
 )
 
 # Add CORS middleware
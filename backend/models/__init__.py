@@ -6,11 +6,13 @@ SQLAlchemy ORM models for the token trackr.
 
 from backend.models.base import Base
 from backend.models.usage import (
+    AggregationWatermark,
     PricingTable,
     TenantDailySummary,
     TenantMonthlySummary,
     TokenUsageRaw,
 )
+from backend.models.views import tenant_summary_view
 
 __all__ = [
     "Base",
@@ -18,4 +20,6 @@ __all__ = [
     "TenantDailySummary",
     "TenantMonthlySummary",
     "PricingTable",
+    "AggregationWatermark",
+    "tenant_summary_view",
 ]
@@ -6,17 +6,20 @@ Models for tracking token usage, costs, and pricing.
 
 from datetime import date, datetime
 from decimal import Decimal
+from typing import Any
 from uuid import UUID, uuid4
 
 from sqlalchemy import (
+    JSON,
     BigInteger,
+    Computed,
     Date,
     Index,
     Numeric,
     String,
-    Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -36,8 +39,8 @@ class TokenUsageRaw(Base, TimestampMixin):
         primary_key=True,
         default=uuid4,
     )
-    tenant_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
-    provider: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
+    tenant_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    provider: Mapped[str] = mapped_column(String(50), nullable=False)
     model: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     prompt_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False)
     completion_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -46,8 +49,17 @@ class TokenUsageRaw(Base, TimestampMixin):
         Numeric(20, 10),
         nullable=False,
         default=Decimal("0"),
+        server_default="0",
     )
-    timestamp: Mapped[datetime] = mapped_column(nullable=False, index=True)
+    # Same cost in integer 1e-10 USD units for fixed-width sums
+    calculated_cost_e10: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    # Partition key, so it is part of the primary key (see __table_args__)
+    timestamp: Mapped[datetime] = mapped_column(primary_key=True, index=True)
     latency_ms: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
     # Host metadata
@@ -55,6 +67,7 @@ class TokenUsageRaw(Base, TimestampMixin):
         String(50),
         nullable=False,
         default="unknown",
+        server_default="unknown",
     )
     hostname: Mapped[str | None] = mapped_column(String(255), nullable=True)
     instance_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
@@ -64,17 +77,37 @@ class TokenUsageRaw(Base, TimestampMixin):
     k8s_namespace: Mapped[str | None] = mapped_column(String(255), nullable=True)
     k8s_node: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
-    # Additional metadata as JSON string
-    metadata_json: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Additional metadata (JSONB on PostgreSQL)
+    metadata_json: Mapped[dict[str, Any] | None] = mapped_column(
+        JSON().with_variant(JSONB, "postgresql"),
+        nullable=True,
+    )
 
     __table_args__ = (
-        Index("idx_usage_tenant_timestamp", "tenant_id", "timestamp"),
         Index("idx_usage_provider_model", "provider", "model"),
         Index("idx_usage_cloud_instance", "cloud_provider", "instance_id"),
         Index("idx_usage_k8s", "k8s_namespace", "k8s_pod"),
+        Index("idx_usage_created_at", "created_at"),
+        Index(
+            "idx_usage_meta_gin",
+            "metadata_json",
+            postgresql_using="gin",
+            postgresql_ops={"metadata_json": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
 
 
+# Tenant/time index for range scans in either direction; covering for newest-first
+# reads (index-only scans on PostgreSQL)
+Index(
+    "idx_usage_tenant_ts_desc",
+    TokenUsageRaw.tenant_id,
+    TokenUsageRaw.timestamp.desc(),
+    postgresql_include=["provider", "model", "total_tokens", "calculated_cost"],
+)
+
+
 class TenantDailySummary(Base, TimestampMixin):
     """
     Daily aggregated token usage per tenant.
@@ -104,13 +137,13 @@ class TenantDailySummary(Base, TimestampMixin):
         nullable=False,
         default=Decimal("0"),
     )
+    total_cost_e10: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
     avg_latency_ms: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
 
     __table_args__ = (
         UniqueConstraint(
             "tenant_id", "date", "provider", "model", "cloud_provider", name="uq_daily_summary"
         ),
-        Index("idx_daily_tenant_date", "tenant_id", "date"),
     )
 
 
@@ -143,15 +176,28 @@ class TenantMonthlySummary(Base, TimestampMixin):
         nullable=False,
         default=Decimal("0"),
     )
+    total_cost_e10: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
 
     __table_args__ = (
         UniqueConstraint(
             "tenant_id", "year", "month", "provider", "model", name="uq_monthly_summary"
         ),
-        Index("idx_monthly_tenant_period", "tenant_id", "year", "month"),
     )
 
 
+class AggregationWatermark(Base, TimestampMixin):
+    """
+    Per-tenant high-water mark for incremental daily aggregation.
+    Raw events ingested at or before ``last_aggregated_at`` are already
+    folded into ``tenant_daily_summary``.
+    """
+
+    __tablename__ = "aggregation_watermark"
+
+    tenant_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    last_aggregated_at: Mapped[datetime] = mapped_column(nullable=False)
+
+
 class PricingTable(Base, TimestampMixin):
     """
     Dynamic pricing configuration.
@@ -175,6 +221,15 @@ class PricingTable(Base, TimestampMixin):
         Numeric(20, 10),
         nullable=False,
     )
+    # Integer 1e-10 USD forms, maintained by the database
+    input_price_per_1k_e10: Mapped[int] = mapped_column(
+        BigInteger,
+        Computed("CAST(input_price_per_1k * 10000000000 AS BIGINT)", persisted=True),
+    )
+    output_price_per_1k_e10: Mapped[int] = mapped_column(
+        BigInteger,
+        Computed("CAST(output_price_per_1k * 10000000000 AS BIGINT)", persisted=True),
+    )
     effective_from: Mapped[date] = mapped_column(Date, nullable=False)
     effective_to: Mapped[date | None] = mapped_column(Date, nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
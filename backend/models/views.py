@@ -0,0 +1,28 @@
+"""
+Materialized Views
+==================
+Lightweight table constructs for database views.
+
+Views are managed by Alembic migrations and are not part of
+``Base.metadata``, so ``create_all`` never tries to create them.
+"""
+
+from sqlalchemy import BigInteger, DateTime, Numeric, String, column, table
+
+# Per-(tenant, provider, model, cloud) usage rollup, refreshed by TenantSummaryRefreshJob
+tenant_summary_view = table(
+    "mv_tenant_summary",
+    column("tenant_id", String(255)),
+    column("provider", String(50)),
+    column("model", String(255)),
+    column("cloud_provider", String(50)),
+    column("total_requests", BigInteger),
+    column("total_prompt_tokens", BigInteger),
+    column("total_completion_tokens", BigInteger),
+    column("total_tokens", BigInteger),
+    column("total_cost", Numeric(20, 10)),
+    column("total_cost_e10", BigInteger),
+    column("first_usage", DateTime(timezone=True)),
+    column("last_usage", DateTime(timezone=True)),
+    column("last_refreshed_at", DateTime(timezone=True)),
+)
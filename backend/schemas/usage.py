@@ -9,7 +9,7 @@ from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class K8sMetadata(BaseModel):
@@ -45,17 +45,12 @@ class UsageEvent(BaseModel):
     host: HostMetadata | None = None
     metadata: dict[str, Any] | None = None
 
-    @field_validator("timestamp", mode="before")
-    @classmethod
-    def parse_timestamp(cls, v: Any) -> datetime:
-        if isinstance(v, str):
-            return datetime.fromisoformat(v.replace("Z", "+00:00"))
-        return v
-
 
 class UsageEventResponse(BaseModel):
     """Response after recording usage event."""
 
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     id: UUID
     tenant_id: str
     provider: str
@@ -64,13 +59,12 @@ class UsageEventResponse(BaseModel):
     calculated_cost: Decimal
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class DailyUsageItem(BaseModel):
     """Single day usage breakdown."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     date: date
     provider: str
     model: str
@@ -97,6 +91,8 @@ class DailySummaryResponse(BaseModel):
 class MonthlySummaryItem(BaseModel):
     """Single month usage breakdown."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     year: int
     month: int
     provider: str
@@ -128,6 +124,7 @@ class TenantSummaryResponse(BaseModel):
     total_cost: Decimal
     first_usage: datetime | None = None
     last_usage: datetime | None = None
+    last_refreshed_at: datetime | None = None
     by_provider: dict[str, dict[str, Any]]
     by_model: dict[str, dict[str, Any]]
     by_cloud_provider: dict[str, dict[str, Any]]
@@ -136,6 +133,8 @@ class TenantSummaryResponse(BaseModel):
 class ModelPricing(BaseModel):
     """Pricing information for a model."""
 
+    model_config = ConfigDict(frozen=True)
+
     model: str
     input_price_per_1k: Decimal
     output_price_per_1k: Decimal
@@ -144,5 +143,7 @@ class ModelPricing(BaseModel):
 class ProviderModelsResponse(BaseModel):
     """Available models and pricing for a provider."""
 
+    model_config = ConfigDict(frozen=True)
+
     provider: str
     models: list[ModelPricing]
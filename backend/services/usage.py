@@ -4,21 +4,29 @@ Usage Service
 Business logic for recording and querying token usage.
 """
 
-import json
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Any
+from uuid import UUID, uuid4
 
+import orjson
 import structlog
-from sqlalchemy import func, select
+from pydantic import TypeAdapter
+from sqlalchemy import FromClause, func, insert, null, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.pricing import get_pricing_engine
+from backend.core.pricing import (
+    E10_PER_USD,
+    cost_to_e10,
+    e10_to_cost,
+    get_pricing_engine,
+)
 from backend.models.usage import (
     TenantDailySummary,
     TenantMonthlySummary,
     TokenUsageRaw,
 )
+from backend.models.views import tenant_summary_view
 from backend.schemas.usage import (
     DailySummaryResponse,
     DailyUsageItem,
@@ -29,7 +37,20 @@ from backend.schemas.usage import (
     UsageEvent,
 )
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(module=__name__)
+
+# Rows per INSERT when bulk-recording events
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Batches larger than this are loaded with COPY on PostgreSQL
+BULK_COPY_THRESHOLD = 100
+
+# Validate whole summary result sets in one call, straight from row attributes
+_DAILY_ITEMS_ADAPTER = TypeAdapter(list[DailyUsageItem])
+_MONTHLY_ITEMS_ADAPTER = TypeAdapter(list[MonthlySummaryItem])
+
+# Shared stand-in for events sent without host metadata; only ever read
+_UNKNOWN_HOST = HostMetadata()
 
 
 class UsageService:
@@ -44,122 +65,258 @@ class UsageService:
         Record a token usage event.
 
         Calculates cost and stores the event with full metadata.
-        """
-        # Calculate cost
-        calculated_cost = self.pricing.calculate_cost(
-            provider=event.provider,
-            model=event.model,
-            prompt_tokens=event.prompt_tokens,
-            completion_tokens=event.completion_tokens,
-            tenant_id=event.tenant_id,
-        )
 
-        # Extract host metadata
-        host = event.host or HostMetadata()
-        k8s = host.k8s
-
-        # Create usage record
-        usage = TokenUsageRaw(
-            tenant_id=event.tenant_id,
-            provider=event.provider,
-            model=event.model,
-            prompt_tokens=event.prompt_tokens,
-            completion_tokens=event.completion_tokens,
-            total_tokens=event.prompt_tokens + event.completion_tokens,
-            calculated_cost=calculated_cost,
-            timestamp=event.timestamp,
-            latency_ms=event.latency_ms,
-            cloud_provider=host.cloud_provider,
-            hostname=host.hostname,
-            instance_id=host.instance_id,
-            k8s_pod=k8s.pod if k8s else None,
-            k8s_namespace=k8s.namespace if k8s else None,
-            k8s_node=k8s.node if k8s else None,
-            metadata_json=json.dumps(event.metadata) if event.metadata else None,
-        )
+        Every column the caller reads (including ``id``) is set in Python, so
+        the single flush is the only round trip; server-defaulted timestamps
+        are left unloaded.
+        """
+        usage = TokenUsageRaw(**self._build_row(event))
 
         self.session.add(usage)
         await self.session.flush()
-        await self.session.refresh(usage)
 
-        logger.info(
+        # Per-event detail is debug-only; the info level stays off the hot path
+        logger.debug(
             "Recorded usage event",
             tenant_id=event.tenant_id,
             provider=event.provider,
             model=event.model,
             tokens=usage.total_tokens,
-            cost=float(calculated_cost),
+            cost=float(usage.calculated_cost),
         )
 
         return usage
 
+    async def record_usage_many(self, events: list[UsageEvent]) -> list[dict[str, Any]]:
+        """
+        Record multiple token usage events in bulk.
+
+        Costs are priced for the whole batch in one vectorized pass and
+        metadata is resolved in Python up front. On PostgreSQL,
+        batches above ``BULK_COPY_THRESHOLD`` are loaded with COPY; otherwise
+        rows are written in chunks of ``BULK_INSERT_CHUNK_SIZE`` with a single
+        executemany per chunk, instead of one flush per event.
+
+        Returns:
+            The inserted rows as dictionaries (including generated IDs)
+        """
+        costs = self.pricing.calculate_cost_many(
+            [
+                (e.provider, e.model, e.prompt_tokens, e.completion_tokens, e.tenant_id)
+                for e in events
+            ]
+        )
+        rows = [self._build_row(event, cost) for event, cost in zip(events, costs, strict=True)]
+
+        if len(rows) > BULK_COPY_THRESHOLD and self._is_postgresql():
+            await self.bulk_copy_usage(rows)
+        else:
+            for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+                await self.session.execute(
+                    insert(TokenUsageRaw),
+                    rows[start : start + BULK_INSERT_CHUNK_SIZE],
+                )
+
+        logger.info("Recorded usage batch", count=len(rows))
+
+        return rows
+
+    async def record_usage_each(self, events: list[UsageEvent]) -> list[TokenUsageRaw]:
+        """
+        Record events one at a time, skipping any that fail.
+
+        Fallback for a failed bulk write: each event runs in its own
+        savepoint, so one bad event does not roll back the others.
+
+        Returns:
+            The recorded rows, in input order, without the skipped events
+        """
+        recorded: list[TokenUsageRaw] = []
+        for index, event in enumerate(events):
+            try:
+                async with self.session.begin_nested():
+                    recorded.append(await self.record_usage(event))
+            except Exception as e:
+                logger.warning("Failed to record event in batch", index=index, error=str(e))
+        return recorded
+
+    async def bulk_copy_usage(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Load prebuilt token_usage_raw rows with the COPY binary protocol.
+
+        Runs on the session's connection, so the rows commit or roll back
+        with the rest of the request.
+        """
+        if not rows:
+            return
+
+        columns = list(rows[0])
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+
+        # SQLAlchemy's asyncpg dialect registers a text codec for jsonb, so
+        # COPY needs the metadata pre-serialized
+        records = [
+            tuple(
+                (
+                    orjson.dumps(row[column]).decode()
+                    if column == "metadata_json" and row[column] is not None
+                    else row[column]
+                )
+                for column in columns
+            )
+            for row in rows
+        ]
+
+        await raw_connection.driver_connection.copy_records_to_table(
+            TokenUsageRaw.__tablename__,
+            records=records,
+            columns=columns,
+        )
+
+    def _is_postgresql(self) -> bool:
+        """Whether the session is bound to a PostgreSQL database."""
+        return self.session.get_bind().dialect.name == "postgresql"
+
+    def _build_row(
+        self, event: UsageEvent, calculated_cost: Decimal | None = None
+    ) -> dict[str, Any]:
+        """Build a token_usage_raw row from a usage event, pricing it if needed."""
+        if calculated_cost is None:
+            calculated_cost = self.pricing.calculate_cost(
+                provider=event.provider,
+                model=event.model,
+                prompt_tokens=event.prompt_tokens,
+                completion_tokens=event.completion_tokens,
+                tenant_id=event.tenant_id,
+            )
+
+        host = event.host or _UNKNOWN_HOST
+        k8s = host.k8s
+
+        return {
+            "id": uuid4(),
+            "tenant_id": event.tenant_id,
+            "provider": event.provider,
+            "model": event.model,
+            "prompt_tokens": event.prompt_tokens,
+            "completion_tokens": event.completion_tokens,
+            "total_tokens": event.prompt_tokens + event.completion_tokens,
+            "calculated_cost": calculated_cost,
+            "calculated_cost_e10": cost_to_e10(calculated_cost),
+            "timestamp": event.timestamp,
+            "latency_ms": event.latency_ms,
+            "cloud_provider": host.cloud_provider,
+            "hostname": host.hostname,
+            "instance_id": host.instance_id,
+            "k8s_pod": k8s.pod if k8s else None,
+            "k8s_namespace": k8s.namespace if k8s else None,
+            "k8s_node": k8s.node if k8s else None,
+            "metadata_json": event.metadata or None,
+        }
+
     async def get_tenant_summary(self, tenant_id: str) -> TenantSummaryResponse:
-        """Get overall usage summary for a tenant."""
-        # Get aggregate stats
-        stmt = select(
-            func.count(TokenUsageRaw.id).label("total_requests"),
-            func.sum(TokenUsageRaw.prompt_tokens).label("total_prompt_tokens"),
-            func.sum(TokenUsageRaw.completion_tokens).label("total_completion_tokens"),
-            func.sum(TokenUsageRaw.total_tokens).label("total_tokens"),
-            func.sum(TokenUsageRaw.calculated_cost).label("total_cost"),
-            func.min(TokenUsageRaw.timestamp).label("first_usage"),
-            func.max(TokenUsageRaw.timestamp).label("last_usage"),
-        ).where(TokenUsageRaw.tenant_id == tenant_id)
+        """
+        Get overall usage summary for a tenant.
 
-        result = await self.session.execute(stmt)
-        row = result.one()
+        Served from the ``mv_tenant_summary`` materialized view, so figures
+        are as of ``last_refreshed_at``.
+        """
+        # One round-trip: every (provider, model, cloud) bucket for the tenant,
+        # folded into totals and per-dimension breakdowns below
+        result = await self.session.execute(select(self._tenant_rollup(tenant_id)))
+
+        totals = {
+            "total_requests": 0,
+            "total_prompt_tokens": 0,
+            "total_completion_tokens": 0,
+            "total_tokens": 0,
+        }
+        total_cost_e10 = 0
+        first_usage = last_usage = last_refreshed_at = None
+        breakdowns: dict[str, dict[str, dict[str, Any]]] = {
+            "provider": {},
+            "model": {},
+            "cloud_provider": {},
+        }
 
-        # Get breakdown by provider
-        by_provider = await self._get_breakdown(tenant_id, "provider")
-        by_model = await self._get_breakdown(tenant_id, "model")
-        by_cloud = await self._get_breakdown(tenant_id, "cloud_provider")
+        for row in result:
+            for key in totals:
+                totals[key] += getattr(row, key) or 0
+            total_cost_e10 += row.total_cost_e10 or 0
+            if row.first_usage is not None and (
+                first_usage is None or row.first_usage < first_usage
+            ):
+                first_usage = row.first_usage
+            if row.last_usage is not None and (last_usage is None or row.last_usage > last_usage):
+                last_usage = row.last_usage
+            if row.last_refreshed_at is not None:
+                last_refreshed_at = row.last_refreshed_at
+
+            for group_by, breakdown in breakdowns.items():
+                bucket = breakdown.setdefault(
+                    getattr(row, group_by),
+                    {"requests": 0, "tokens": 0, "cost": 0},
+                )
+                bucket["requests"] += int(row.total_requests or 0)
+                bucket["tokens"] += int(row.total_tokens or 0)
+                bucket["cost"] += int(row.total_cost_e10 or 0)
+
+        # Costs are summed as integer 1e-10 USD units and converted once here
+        for breakdown in breakdowns.values():
+            for bucket in breakdown.values():
+                bucket["cost"] /= E10_PER_USD
 
         return TenantSummaryResponse(
             tenant_id=tenant_id,
-            total_requests=row.total_requests or 0,
-            total_prompt_tokens=row.total_prompt_tokens or 0,
-            total_completion_tokens=row.total_completion_tokens or 0,
-            total_tokens=row.total_tokens or 0,
-            total_cost=row.total_cost or Decimal("0"),
-            first_usage=row.first_usage,
-            last_usage=row.last_usage,
-            by_provider=by_provider,
-            by_model=by_model,
-            by_cloud_provider=by_cloud,
+            **totals,
+            total_cost=e10_to_cost(total_cost_e10),
+            first_usage=first_usage,
+            last_usage=last_usage,
+            last_refreshed_at=last_refreshed_at,
+            by_provider=breakdowns["provider"],
+            by_model=breakdowns["model"],
+            by_cloud_provider=breakdowns["cloud_provider"],
         )
 
-    async def _get_breakdown(
-        self,
-        tenant_id: str,
-        group_by: str,
-    ) -> dict[str, dict[str, Any]]:
-        """Get usage breakdown by a specific dimension."""
-        column = getattr(TokenUsageRaw, group_by)
+    def _tenant_rollup(self, tenant_id: str) -> FromClause:
+        """
+        Get per-(provider, model, cloud_provider) usage rollups for a tenant.
 
-        stmt = (
+        Reads the materialized view on PostgreSQL; other dialects (e.g. the
+        SQLite test database) aggregate ``token_usage_raw`` directly.
+        """
+        if self._is_postgresql():
+            return (
+                select(tenant_summary_view)
+                .where(tenant_summary_view.c.tenant_id == tenant_id)
+                .subquery("rollup")
+            )
+
+        return (
             select(
-                column,
-                func.count(TokenUsageRaw.id).label("requests"),
-                func.sum(TokenUsageRaw.total_tokens).label("tokens"),
-                func.sum(TokenUsageRaw.calculated_cost).label("cost"),
+                TokenUsageRaw.provider,
+                TokenUsageRaw.model,
+                TokenUsageRaw.cloud_provider,
+                func.count(TokenUsageRaw.id).label("total_requests"),
+                func.sum(TokenUsageRaw.prompt_tokens).label("total_prompt_tokens"),
+                func.sum(TokenUsageRaw.completion_tokens).label("total_completion_tokens"),
+                func.sum(TokenUsageRaw.total_tokens).label("total_tokens"),
+                func.sum(TokenUsageRaw.calculated_cost).label("total_cost"),
+                func.sum(TokenUsageRaw.calculated_cost_e10).label("total_cost_e10"),
+                func.min(TokenUsageRaw.timestamp).label("first_usage"),
+                func.max(TokenUsageRaw.timestamp).label("last_usage"),
+                null().label("last_refreshed_at"),
             )
             .where(TokenUsageRaw.tenant_id == tenant_id)
-            .group_by(column)
+            .group_by(
+                TokenUsageRaw.provider,
+                TokenUsageRaw.model,
+                TokenUsageRaw.cloud_provider,
+            )
+            .subquery("rollup")
         )
 
-        result = await self.session.execute(stmt)
-
-        breakdown = {}
-        for row in result:
-            key = getattr(row, group_by)
-            breakdown[key] = {
-                "requests": row.requests,
-                "tokens": row.tokens or 0,
-                "cost": float(row.cost or 0),
-            }
-
-        return breakdown
-
     async def get_daily_summary(
         self,
         tenant_id: str,
@@ -172,9 +329,21 @@ class UsageService:
         if not start_date:
             start_date = end_date - timedelta(days=30)
 
-        # Query pre-aggregated daily summary
+        # Query pre-aggregated daily summary; plain rows, no ORM entities
         stmt = (
-            select(TenantDailySummary)
+            select(
+                TenantDailySummary.date,
+                TenantDailySummary.provider,
+                TenantDailySummary.model,
+                TenantDailySummary.cloud_provider,
+                TenantDailySummary.total_requests,
+                TenantDailySummary.total_prompt_tokens,
+                TenantDailySummary.total_completion_tokens,
+                TenantDailySummary.total_tokens,
+                TenantDailySummary.total_cost,
+                TenantDailySummary.total_cost_e10,
+                TenantDailySummary.avg_latency_ms,
+            )
             .where(
                 TenantDailySummary.tenant_id == tenant_id,
                 TenantDailySummary.date >= start_date,
@@ -183,26 +352,11 @@ class UsageService:
             .order_by(TenantDailySummary.date.desc())
         )
 
-        result = await self.session.execute(stmt)
-        rows = result.scalars().all()
-
-        items = [
-            DailyUsageItem(
-                date=row.date,
-                provider=row.provider,
-                model=row.model,
-                cloud_provider=row.cloud_provider,
-                total_requests=row.total_requests,
-                total_prompt_tokens=row.total_prompt_tokens,
-                total_completion_tokens=row.total_completion_tokens,
-                total_tokens=row.total_tokens,
-                total_cost=row.total_cost,
-                avg_latency_ms=row.avg_latency_ms,
-            )
-            for row in rows
-        ]
+        rows = (await self.session.execute(stmt)).all()
+
+        items = _DAILY_ITEMS_ADAPTER.validate_python(rows, from_attributes=True)
 
-        total_cost = sum(item.total_cost for item in items)
+        total_cost = e10_to_cost(sum(row.total_cost_e10 for row in rows))
         total_tokens = sum(item.total_tokens for item in items)
 
         return DailySummaryResponse(
@@ -221,7 +375,18 @@ class UsageService:
         month: int | None = None,
     ) -> MonthlySummaryResponse:
         """Get monthly usage summary for a tenant."""
-        stmt = select(TenantMonthlySummary).where(TenantMonthlySummary.tenant_id == tenant_id)
+        stmt = select(
+            TenantMonthlySummary.year,
+            TenantMonthlySummary.month,
+            TenantMonthlySummary.provider,
+            TenantMonthlySummary.model,
+            TenantMonthlySummary.total_requests,
+            TenantMonthlySummary.total_prompt_tokens,
+            TenantMonthlySummary.total_completion_tokens,
+            TenantMonthlySummary.total_tokens,
+            TenantMonthlySummary.total_cost,
+            TenantMonthlySummary.total_cost_e10,
+        ).where(TenantMonthlySummary.tenant_id == tenant_id)
 
         if year:
             stmt = stmt.where(TenantMonthlySummary.year == year)
@@ -233,25 +398,11 @@ class UsageService:
             TenantMonthlySummary.month.desc(),
         )
 
-        result = await self.session.execute(stmt)
-        rows = result.scalars().all()
-
-        items = [
-            MonthlySummaryItem(
-                year=row.year,
-                month=row.month,
-                provider=row.provider,
-                model=row.model,
-                total_requests=row.total_requests,
-                total_prompt_tokens=row.total_prompt_tokens,
-                total_completion_tokens=row.total_completion_tokens,
-                total_tokens=row.total_tokens,
-                total_cost=row.total_cost,
-            )
-            for row in rows
-        ]
+        rows = (await self.session.execute(stmt)).all()
 
-        total_cost = sum(item.total_cost for item in items)
+        items = _MONTHLY_ITEMS_ADAPTER.validate_python(rows, from_attributes=True)
+
+        total_cost = e10_to_cost(sum(row.total_cost_e10 for row in rows))
         total_tokens = sum(item.total_tokens for item in items)
 
         return MonthlySummaryResponse(
@@ -267,17 +418,35 @@ class UsageService:
         start_time: datetime | None = None,
         end_time: datetime | None = None,
         limit: int = 1000,
-        offset: int = 0,
-    ) -> list[TokenUsageRaw]:
-        """Get raw usage events for a tenant."""
+        cursor: tuple[datetime, UUID] | None = None,
+    ) -> tuple[list[TokenUsageRaw], tuple[datetime, UUID] | None]:
+        """
+        Get raw usage events for a tenant, newest first.
+
+        Pages with a keyset cursor rather than OFFSET, so every page is an
+        index seek on (tenant_id, timestamp) however deep it is.
+
+        Args:
+            cursor: ``next_cursor`` from the previous page (first page if None)
+
+        Returns:
+            Tuple of (events, next_cursor); next_cursor is None on the last page
+        """
         stmt = select(TokenUsageRaw).where(TokenUsageRaw.tenant_id == tenant_id)
 
         if start_time:
             stmt = stmt.where(TokenUsageRaw.timestamp >= start_time)
         if end_time:
             stmt = stmt.where(TokenUsageRaw.timestamp <= end_time)
+        if cursor:
+            stmt = stmt.where(tuple_(TokenUsageRaw.timestamp, TokenUsageRaw.id) < cursor)
 
-        stmt = stmt.order_by(TokenUsageRaw.timestamp.desc()).limit(limit).offset(offset)
+        stmt = stmt.order_by(TokenUsageRaw.timestamp.desc(), TokenUsageRaw.id.desc()).limit(limit)
 
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        events = list(result.scalars().all())
+
+        next_cursor = None
+        if len(events) == limit:
+            next_cursor = (events[-1].timestamp, events[-1].id)
+        return events, next_cursor
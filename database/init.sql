@@ -9,7 +9,7 @@ CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Create the token_usage_raw table
 CREATE TABLE IF NOT EXISTS token_usage_raw (
-    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    id UUID NOT NULL DEFAULT uuid_generate_v4(),
     tenant_id VARCHAR(255) NOT NULL,
     provider VARCHAR(50) NOT NULL,
     model VARCHAR(255) NOT NULL,
@@ -17,6 +17,7 @@ CREATE TABLE IF NOT EXISTS token_usage_raw (
     completion_tokens BIGINT NOT NULL,
     total_tokens BIGINT NOT NULL,
     calculated_cost NUMERIC(20, 10) NOT NULL DEFAULT 0,
+    calculated_cost_e10 BIGINT NOT NULL DEFAULT 0,
     timestamp TIMESTAMPTZ NOT NULL,
     latency_ms BIGINT,
     cloud_provider VARCHAR(50) NOT NULL DEFAULT 'unknown',
@@ -25,20 +26,44 @@ CREATE TABLE IF NOT EXISTS token_usage_raw (
     k8s_pod VARCHAR(255),
     k8s_namespace VARCHAR(255),
     k8s_node VARCHAR(255),
-    metadata_json TEXT,
+    metadata_json JSONB,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-);
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+
+-- Pre-create the current and next 2 monthly partitions (PARTITION_PREMAKE_MONTHS);
+-- the partition maintenance job keeps creating them ahead from here on
+DO $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW() AT TIME ZONE 'UTC')::DATE;
+BEGIN
+    FOR i IN 0..2 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF token_usage_raw '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'token_usage_raw_p' || to_char(month_start, 'YYYYMM'),
+            month_start::TEXT || ' 00:00:00+00',
+            (month_start + INTERVAL '1 month')::DATE::TEXT || ' 00:00:00+00'
+        );
+        month_start := (month_start + INTERVAL '1 month')::DATE;
+    END LOOP;
+END;
+$$;
+
+-- The default partition only catches events outside the created range
+CREATE TABLE IF NOT EXISTS token_usage_raw_default PARTITION OF token_usage_raw DEFAULT;
 
 -- Create indexes for token_usage_raw
-CREATE INDEX IF NOT EXISTS idx_usage_tenant_id ON token_usage_raw(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_usage_provider ON token_usage_raw(provider);
 CREATE INDEX IF NOT EXISTS idx_usage_model ON token_usage_raw(model);
 CREATE INDEX IF NOT EXISTS idx_usage_timestamp ON token_usage_raw(timestamp);
-CREATE INDEX IF NOT EXISTS idx_usage_tenant_timestamp ON token_usage_raw(tenant_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_usage_tenant_ts_desc ON token_usage_raw(tenant_id, timestamp DESC)
+    INCLUDE (provider, model, total_tokens, calculated_cost);
 CREATE INDEX IF NOT EXISTS idx_usage_provider_model ON token_usage_raw(provider, model);
 CREATE INDEX IF NOT EXISTS idx_usage_cloud_instance ON token_usage_raw(cloud_provider, instance_id);
 CREATE INDEX IF NOT EXISTS idx_usage_k8s ON token_usage_raw(k8s_namespace, k8s_pod);
+CREATE INDEX IF NOT EXISTS idx_usage_created_at ON token_usage_raw(created_at);
+CREATE INDEX IF NOT EXISTS idx_usage_meta_gin ON token_usage_raw USING GIN (metadata_json jsonb_path_ops);
 
 -- Create tenant_daily_summary table
 CREATE TABLE IF NOT EXISTS tenant_daily_summary (
@@ -53,14 +78,13 @@ CREATE TABLE IF NOT EXISTS tenant_daily_summary (
     total_completion_tokens BIGINT NOT NULL DEFAULT 0,
     total_tokens BIGINT NOT NULL DEFAULT 0,
     total_cost NUMERIC(20, 10) NOT NULL DEFAULT 0,
+    total_cost_e10 BIGINT NOT NULL DEFAULT 0,
     avg_latency_ms BIGINT,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     CONSTRAINT uq_daily_summary UNIQUE (tenant_id, date, provider, model, cloud_provider)
 );
 
-CREATE INDEX IF NOT EXISTS idx_daily_tenant_date ON tenant_daily_summary(tenant_id, date);
-
 -- Create tenant_monthly_summary table
 CREATE TABLE IF NOT EXISTS tenant_monthly_summary (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -74,13 +98,12 @@ CREATE TABLE IF NOT EXISTS tenant_monthly_summary (
     total_completion_tokens BIGINT NOT NULL DEFAULT 0,
     total_tokens BIGINT NOT NULL DEFAULT 0,
     total_cost NUMERIC(20, 10) NOT NULL DEFAULT 0,
+    total_cost_e10 BIGINT NOT NULL DEFAULT 0,
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     CONSTRAINT uq_monthly_summary UNIQUE (tenant_id, year, month, provider, model)
 );
 
-CREATE INDEX IF NOT EXISTS idx_monthly_tenant_period ON tenant_monthly_summary(tenant_id, year, month);
-
 -- Create pricing_table
 CREATE TABLE IF NOT EXISTS pricing_table (
     id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -88,6 +111,10 @@ CREATE TABLE IF NOT EXISTS pricing_table (
     model VARCHAR(255) NOT NULL,
     input_price_per_1k NUMERIC(20, 10) NOT NULL,
     output_price_per_1k NUMERIC(20, 10) NOT NULL,
+    input_price_per_1k_e10 BIGINT GENERATED ALWAYS AS
+        (CAST(input_price_per_1k * 10000000000 AS BIGINT)) STORED,
+    output_price_per_1k_e10 BIGINT GENERATED ALWAYS AS
+        (CAST(output_price_per_1k * 10000000000 AS BIGINT)) STORED,
     effective_from DATE NOT NULL,
     effective_to DATE,
     is_active BOOLEAN NOT NULL DEFAULT TRUE,
@@ -98,6 +125,37 @@ CREATE TABLE IF NOT EXISTS pricing_table (
 
 CREATE INDEX IF NOT EXISTS idx_pricing_lookup ON pricing_table(provider, model, is_active);
 
+-- Create aggregation_watermark table (per-tenant incremental aggregation progress)
+CREATE TABLE IF NOT EXISTS aggregation_watermark (
+    tenant_id VARCHAR(255) PRIMARY KEY,
+    last_aggregated_at TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Per-(tenant, provider, model, cloud) rollup served by /tenant/{id}/summary
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_tenant_summary AS
+SELECT
+    tenant_id,
+    provider,
+    model,
+    cloud_provider,
+    COUNT(*) AS total_requests,
+    SUM(prompt_tokens) AS total_prompt_tokens,
+    SUM(completion_tokens) AS total_completion_tokens,
+    SUM(total_tokens) AS total_tokens,
+    SUM(calculated_cost) AS total_cost,
+    SUM(calculated_cost_e10) AS total_cost_e10,
+    MIN(timestamp) AS first_usage,
+    MAX(timestamp) AS last_usage,
+    now() AS last_refreshed_at
+FROM token_usage_raw
+GROUP BY tenant_id, provider, model, cloud_provider;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_tenant_summary
+    ON mv_tenant_summary(tenant_id, provider, model, cloud_provider);
+
 -- Create function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -132,6 +190,12 @@ CREATE TRIGGER update_pricing_table_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+DROP TRIGGER IF EXISTS update_aggregation_watermark_updated_at ON aggregation_watermark;
+CREATE TRIGGER update_aggregation_watermark_updated_at
+    BEFORE UPDATE ON aggregation_watermark
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
 -- Insert some sample pricing data
 INSERT INTO pricing_table (provider, model, input_price_per_1k, output_price_per_1k, effective_from)
 VALUES 
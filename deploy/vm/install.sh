@@ -120,7 +120,7 @@ install_application() {
     else
         log_warn "No source found, installing dependencies only"
         "$INSTALL_DIR/venv/bin/pip" install \
-            fastapi uvicorn pydantic pydantic-settings \
+            fastapi "uvicorn[standard]" pydantic pydantic-settings orjson numpy \
             sqlalchemy asyncpg psycopg2-binary alembic \
             httpx aiohttp apscheduler pyyaml structlog \
             tenacity prometheus-client redis boto3 openai \
@@ -197,7 +197,7 @@ User=$USER
 Group=$GROUP
 WorkingDirectory=$INSTALL_DIR
 EnvironmentFile=$CONFIG_DIR/token-trackr.env
-ExecStart=$INSTALL_DIR/venv/bin/uvicorn backend.main:app --host \${APP_HOST} --port \${APP_PORT}
+ExecStart=$INSTALL_DIR/venv/bin/uvicorn backend.main:app --host \${APP_HOST} --port \${APP_PORT} --loop uvloop --http httptools
 ExecReload=/bin/kill -HUP \$MAINPID
 Restart=always
 RestartSec=5
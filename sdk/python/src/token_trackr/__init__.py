@@ -5,7 +5,7 @@ Python SDK for tracking LLM token consumption across
 AWS Bedrock, Azure OpenAI, and Google Gemini.
 """
 
-from token_trackr.client import TokenTrackrClient
+from token_trackr.client import AsyncTokenTrackrClient, TokenTrackrClient
 from token_trackr.config import TokenTrackrConfig
 from token_trackr.metadata import get_host_metadata
 from token_trackr.wrappers import (
@@ -14,10 +14,11 @@ from token_trackr.wrappers import (
     GeminiWrapper,
 )
 
-__version__ = "1.0.0"
+__version__ = "2.0.0"
 
 __all__ = [
     "TokenTrackrClient",
+    "AsyncTokenTrackrClient",
     "TokenTrackrConfig",
     "BedrockWrapper",
     "AzureOpenAIWrapper",
@@ -4,17 +4,21 @@ Token Trackr Client
 Main client for sending usage events to the backend.
 """
 
+import asyncio
 import atexit
-import json
 import logging
+import os
+import socket
 import threading
 import time
 from collections import deque
 from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any
 
 import httpx
+import orjson
 from tenacity import (
     retry,
     retry_if_exception_type,
@@ -29,6 +33,58 @@ from token_trackr.models import UsageEvent, UsageResponse
 logger = logging.getLogger(__name__)
 
 
+def _default(obj: Any) -> Any:
+    """Encode values orjson has no native support for."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _build_headers(config: TokenTrackrConfig) -> dict[str, str]:
+    """Get HTTP headers for API requests."""
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": "token-trackr-sdk-python/2.0.0",
+    }
+    if config.api_key:
+        headers["Authorization"] = f"Bearer {config.api_key}"
+    return headers
+
+
+def _parse_responses(data: Any) -> list[UsageResponse]:
+    """Parse a single or batch usage response body."""
+    if isinstance(data, list):
+        return [UsageResponse.from_dict(item) for item in data]
+    return [UsageResponse.from_dict(data)]
+
+
+def _save_to_fallback(events: list[UsageEvent]) -> None:
+    """Save events to local file as fallback."""
+    fallback_dir = Path.home() / ".token-trackr" / "fallback"
+    fallback_dir.mkdir(parents=True, exist_ok=True)
+
+    fallback_file = fallback_dir / f"events_{int(time.time())}.json"
+    tmp_file = fallback_file.with_suffix(".json.tmp")
+
+    try:
+        # Write aside and rename, so recovery never reads a partial file
+        tmp_file.write_bytes(_dumps(events))
+        os.replace(tmp_file, fallback_file)
+        logger.info(f"Saved {len(events)} events to fallback: {fallback_file}")
+    except Exception as e:
+        logger.error(f"Failed to save fallback: {e}")
+
+
+def _dumps(payload: Any) -> bytes:
+    """
+    Encode usage events (or lists of them) as a JSON request body.
+
+    orjson serializes the event dataclasses natively, without an
+    intermediate dict per event.
+    """
+    return orjson.dumps(payload, default=_default)
+
+
 class TokenTrackrClient:
     """
     Client for sending token usage events to the Token Trackr backend.
@@ -42,8 +98,8 @@ class TokenTrackrClient:
 
     def __init__(
         self,
-        config: Optional[TokenTrackrConfig] = None,
-        tenant_id: Optional[str] = None,
+        config: TokenTrackrConfig | None = None,
+        tenant_id: str | None = None,
     ):
         """
         Initialize the Token Trackr client.
@@ -57,9 +113,10 @@ class TokenTrackrClient:
             self.config.tenant_id = tenant_id
 
         # Initialize host metadata (cached)
-        self._host_metadata: Optional[HostMetadata] = None
+        self._host_metadata: HostMetadata | None = None
+        self._host_payload: dict[str, Any] | None = None
 
-        # Event queue for batching
+        # Event queue for batching; the lock only guards re-queueing failed events
         self._queue: deque[UsageEvent] = deque(maxlen=self.config.max_queue_size)
         self._lock = threading.Lock()
 
@@ -70,9 +127,16 @@ class TokenTrackrClient:
             headers=self._get_headers(),
         )
 
-        # Background flush thread
+        # Checked by wrappers before any timing or token extraction
+        self.enabled = self.config.enabled
+
+        # Events discarded because the queue was full (oldest are dropped first)
+        self.dropped_events = 0
+
+        # Background flush thread, woken early once a full batch is queued
         self._stop_event = threading.Event()
-        self._flush_thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._flush_thread: threading.Thread | None = None
 
         if self.config.async_mode:
             self._start_background_flush()
@@ -82,13 +146,7 @@ class TokenTrackrClient:
 
     def _get_headers(self) -> dict[str, str]:
         """Get HTTP headers for API requests."""
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "token-trackr-sdk-python/1.0.0",
-        }
-        if self.config.api_key:
-            headers["Authorization"] = f"Bearer {self.config.api_key}"
-        return headers
+        return _build_headers(self.config)
 
     @property
     def host_metadata(self) -> HostMetadata:
@@ -97,12 +155,20 @@ class TokenTrackrClient:
             self._host_metadata = get_host_metadata()
         return self._host_metadata
 
+    @property
+    def host_payload(self) -> dict[str, Any]:
+        """Get the host metadata dict sent with every event (built once, never mutated)."""
+        if self._host_payload is None:
+            self._host_payload = self.host_metadata.to_dict()
+        return self._host_payload
+
     def _start_background_flush(self) -> None:
         """Start background thread for periodic flushing."""
 
         def flush_worker():
             while not self._stop_event.is_set():
-                time.sleep(self.config.flush_interval)
+                self._wakeup.wait(self.config.flush_interval)
+                self._wakeup.clear()
                 try:
                     self.flush()
                 except Exception as e:
@@ -117,9 +183,9 @@ class TokenTrackrClient:
         model: str,
         prompt_tokens: int,
         completion_tokens: int,
-        latency_ms: Optional[int] = None,
-        metadata: Optional[dict[str, Any]] = None,
-        timestamp: Optional[datetime] = None,
+        latency_ms: int | None = None,
+        metadata: dict[str, Any] | None = None,
+        timestamp: datetime | None = None,
     ) -> None:
         """
         Record a token usage event.
@@ -133,6 +199,9 @@ class TokenTrackrClient:
             metadata: Additional metadata
             timestamp: Event timestamp (defaults to now)
         """
+        if not self.enabled:
+            return
+
         event = UsageEvent(
             tenant_id=self.config.tenant_id,
             provider=provider,
@@ -141,17 +210,19 @@ class TokenTrackrClient:
             completion_tokens=completion_tokens,
             timestamp=timestamp or datetime.utcnow(),
             latency_ms=latency_ms,
-            host=self.host_metadata.to_dict(),
+            host=self.host_payload,
             metadata=metadata,
         )
 
-        with self._lock:
-            self._queue.append(event)
+        # deque.append is atomic, so producers never contend on a lock
+        if len(self._queue) == self.config.max_queue_size:
+            self.dropped_events += 1
+        self._queue.append(event)
 
-        # Flush if batch size reached
+        # Flush if batch size reached; in async mode the flush thread sends it
         if len(self._queue) >= self.config.batch_size:
             if self.config.async_mode:
-                threading.Thread(target=self.flush, daemon=True).start()
+                self._wakeup.set()
             else:
                 self.flush()
 
@@ -162,22 +233,27 @@ class TokenTrackrClient:
         Returns:
             List of responses from the backend
         """
-        with self._lock:
-            if not self._queue:
-                return []
+        # Drain with atomic pops, bounded to the current length so that
+        # concurrent producers cannot keep one flush running indefinitely
+        events: list[UsageEvent] = []
+        try:
+            for _ in range(len(self._queue)):
+                events.append(self._queue.popleft())
+        except IndexError:
+            # Another flush drained the queue concurrently
+            pass
 
-            events = list(self._queue)
-            self._queue.clear()
+        if not events:
+            return []
 
         try:
             return self._send_batch(events)
         except Exception as e:
             logger.error(f"Failed to send events: {e}")
-            # Put events back in queue for retry
+            # Put events back at the front of the queue, oldest first, for retry
             with self._lock:
-                for event in events:
-                    if len(self._queue) < self.config.max_queue_size:
-                        self._queue.appendleft(event)
+                room = max(self.config.max_queue_size - len(self._queue), 0)
+                self._queue.extendleft(reversed(events[:room]))
             # Save to local fallback
             self._save_to_fallback(events)
             return []
@@ -189,41 +265,24 @@ class TokenTrackrClient:
     )
     def _send_batch(self, events: list[UsageEvent]) -> list[UsageResponse]:
         """Send a batch of events to the backend with retry."""
+        # Content-Type is already set on the client; the body is pre-encoded
         if len(events) == 1:
-            response = self._client.post(
-                "/usage",
-                json=events[0].model_dump(mode="json"),
-            )
+            response = self._client.post("/usage", content=_dumps(events[0]))
         else:
-            response = self._client.post(
-                "/usage/batch",
-                json=[e.model_dump(mode="json") for e in events],
-            )
+            response = self._client.post("/usage/batch", content=_dumps(events))
 
         response.raise_for_status()
 
-        data = response.json()
-        if isinstance(data, list):
-            return [UsageResponse(**item) for item in data]
-        return [UsageResponse(**data)]
+        return _parse_responses(response.json())
 
     def _save_to_fallback(self, events: list[UsageEvent]) -> None:
         """Save events to local file as fallback."""
-        fallback_dir = Path.home() / ".token-trackr" / "fallback"
-        fallback_dir.mkdir(parents=True, exist_ok=True)
-
-        fallback_file = fallback_dir / f"events_{int(time.time())}.json"
-
-        try:
-            with open(fallback_file, "w") as f:
-                json.dump([e.model_dump(mode="json") for e in events], f)
-            logger.info(f"Saved {len(events)} events to fallback: {fallback_file}")
-        except Exception as e:
-            logger.error(f"Failed to save fallback: {e}")
+        _save_to_fallback(events)
 
     def close(self) -> None:
         """Close the client and flush remaining events."""
         self._stop_event.set()
+        self._wakeup.set()
 
         if self._flush_thread and self._flush_thread.is_alive():
             self._flush_thread.join(timeout=5)
@@ -243,15 +302,243 @@ class TokenTrackrClient:
         self.close()
 
 
+class AsyncTokenTrackrClient:
+    """
+    Asyncio client for sending token usage events to the Token Trackr backend.
+
+    For applications that run on an event loop. ``record()`` only enqueues
+    the event; a single background task sends batches with
+    ``httpx.AsyncClient``, so producers never take locks or wake threads.
+
+    Use as ``async with AsyncTokenTrackrClient() as client:``, or call
+    ``start()`` and ``close()`` explicitly.
+    """
+
+    def __init__(
+        self,
+        config: TokenTrackrConfig | None = None,
+        tenant_id: str | None = None,
+    ):
+        """
+        Initialize the async Token Trackr client.
+
+        Args:
+            config: Configuration object (uses defaults if not provided)
+            tenant_id: Override tenant ID from config
+        """
+        self.config = config or TokenTrackrConfig()
+        if tenant_id:
+            self.config.tenant_id = tenant_id
+
+        self._host_metadata: HostMetadata | None = None
+        self._host_payload: dict[str, Any] | None = None
+
+        # Sent until detection finishes, so record() never waits on metadata probes
+        self._placeholder_payload = HostMetadata(hostname=socket.gethostname()).to_dict()
+        self._metadata_task: asyncio.Task[None] | None = None
+
+        # Only touched from the event loop, so no lock is needed to re-queue
+        self._queue: deque[UsageEvent] = deque(maxlen=self.config.max_queue_size)
+
+        self._client = httpx.AsyncClient(
+            base_url=self.config.backend_url,
+            timeout=self.config.timeout,
+            headers=_build_headers(self.config),
+        )
+
+        # Checked by wrappers before any timing or token extraction
+        self.enabled = self.config.enabled
+
+        # Events discarded because the queue was full (oldest are dropped first)
+        self.dropped_events = 0
+
+        # Set when batch_size events are waiting, or on close
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def host_metadata(self) -> HostMetadata:
+        """Get cached host metadata."""
+        if self._host_metadata is None:
+            self._host_metadata = get_host_metadata()
+        return self._host_metadata
+
+    @property
+    def host_payload(self) -> dict[str, Any]:
+        """
+        Get the host metadata dict sent with every event (built once, never mutated).
+
+        Until detection finishes this is a hostname-only placeholder; the
+        first call schedules detection in a worker thread.
+        """
+        if self._host_payload is None:
+            if self._host_metadata is None:
+                self._detect_host_metadata()
+                return self._placeholder_payload
+            self._host_payload = self._host_metadata.to_dict()
+        return self._host_payload
+
+    def _detect_host_metadata(self) -> asyncio.Task[None] | None:
+        """Schedule host metadata detection once, if an event loop is running."""
+        if self._metadata_task is None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return None
+            self._metadata_task = asyncio.create_task(self._resolve_host_metadata())
+        return self._metadata_task
+
+    async def _resolve_host_metadata(self) -> None:
+        """Probe host metadata off the event loop."""
+        metadata = await asyncio.to_thread(get_host_metadata)
+        self._host_metadata = metadata
+        self._host_payload = metadata.to_dict()
+
+    async def start(self) -> None:
+        """Detect host metadata off the event loop and start the background flusher."""
+        if self._host_metadata is None:
+            task = self._detect_host_metadata()
+            if task is not None:
+                await task
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._run_flusher())
+
+    async def _run_flusher(self) -> None:
+        """Flush every flush_interval, or as soon as a full batch is waiting."""
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.config.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: int | None = None,
+        metadata: dict[str, Any] | None = None,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """
+        Record a token usage event.
+
+        Never blocks: the event is queued for the background flusher. When
+        the queue is full the oldest event is dropped, as in the sync client.
+        Events recorded before host metadata is detected carry only the
+        hostname.
+
+        Args:
+            provider: LLM provider (bedrock, azure_openai, gemini)
+            model: Model identifier
+            prompt_tokens: Number of input tokens
+            completion_tokens: Number of output tokens
+            latency_ms: Request latency in milliseconds
+            metadata: Additional metadata
+            timestamp: Event timestamp (defaults to now)
+        """
+        if not self.enabled:
+            return
+
+        event = UsageEvent(
+            tenant_id=self.config.tenant_id,
+            provider=provider,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            timestamp=timestamp or datetime.utcnow(),
+            latency_ms=latency_ms,
+            host=self.host_payload,
+            metadata=metadata,
+        )
+
+        if len(self._queue) == self.config.max_queue_size:
+            self.dropped_events += 1
+        self._queue.append(event)
+
+        if len(self._queue) >= self.config.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> list[UsageResponse]:
+        """
+        Flush all queued events to the backend.
+
+        Returns:
+            List of responses from the backend
+        """
+        events = list(self._queue)
+        self._queue.clear()
+
+        if not events:
+            return []
+
+        try:
+            return await self._send_batch(events)
+        except Exception as e:
+            logger.error(f"Failed to send events: {e}")
+            # Put events back at the front of the queue, oldest first, for retry
+            room = max(self.config.max_queue_size - len(self._queue), 0)
+            self._queue.extendleft(reversed(events[:room]))
+            await asyncio.to_thread(_save_to_fallback, events)
+            return []
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
+    )
+    async def _send_batch(self, events: list[UsageEvent]) -> list[UsageResponse]:
+        """Send a batch of events to the backend with retry."""
+        if len(events) == 1:
+            response = await self._client.post("/usage", content=_dumps(events[0]))
+        else:
+            response = await self._client.post("/usage/batch", content=_dumps(events))
+
+        response.raise_for_status()
+
+        return _parse_responses(response.json())
+
+    async def close(self) -> None:
+        """Stop the background flusher, send remaining events and close the client."""
+        self._closing = True
+        self._wakeup.set()
+
+        # Let an in-flight flush finish rather than cancelling it mid-request
+        if self._flush_task is not None:
+            await self._flush_task
+
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final flush failed: {e}")
+
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncTokenTrackrClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+
 # Global client instance
-_global_client: Optional[TokenTrackrClient] = None
+_global_client: TokenTrackrClient | None = None
+_global_client_lock = threading.Lock()
 
 
 def get_client() -> TokenTrackrClient:
     """Get or create the global client instance."""
     global _global_client
     if _global_client is None:
-        _global_client = TokenTrackrClient()
+        # Checked again under the lock so concurrent first calls share one client
+        with _global_client_lock:
+            if _global_client is None:
+                _global_client = TokenTrackrClient()
     return _global_client
 
 
@@ -6,7 +6,6 @@ Configuration management for the Token Trackr SDK.
 
 import os
 from dataclasses import dataclass, field
-from typing import Optional
 
 
 @dataclass
@@ -24,12 +23,13 @@ class TokenTrackrConfig:
         retry_attempts: Number of retry attempts for failed requests
         timeout: Request timeout in seconds
         async_mode: Enable non-blocking event sending
+        enabled: Track usage; when false, wrappers call the provider directly
     """
 
     backend_url: str = field(
         default_factory=lambda: os.getenv("TOKEN_TRACKR_URL", "http://localhost:8000")
     )
-    api_key: Optional[str] = field(default_factory=lambda: os.getenv("TOKEN_TRACKR_API_KEY"))
+    api_key: str | None = field(default_factory=lambda: os.getenv("TOKEN_TRACKR_API_KEY"))
     tenant_id: str = field(default_factory=lambda: os.getenv("TOKEN_TRACKR_TENANT_ID", "default"))
     batch_size: int = 10
     flush_interval: float = 5.0
@@ -37,6 +37,10 @@ class TokenTrackrConfig:
     retry_attempts: int = 3
     timeout: float = 30.0
     async_mode: bool = True
+    enabled: bool = field(
+        default_factory=lambda: os.getenv("TOKEN_TRACKR_ENABLED", "true").lower()
+        not in ("0", "false", "no")
+    )
 
     def __post_init__(self) -> None:
         """Validate configuration after initialization."""
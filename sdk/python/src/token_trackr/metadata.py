@@ -6,8 +6,10 @@ Collect metadata about the host environment.
 
 import os
 import socket
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
 
 import httpx
 
@@ -16,9 +18,9 @@ import httpx
 class K8sMetadata:
     """Kubernetes metadata."""
 
-    pod: Optional[str] = None
-    namespace: Optional[str] = None
-    node: Optional[str] = None
+    pod: str | None = None
+    namespace: str | None = None
+    node: str | None = None
 
 
 @dataclass
@@ -27,8 +29,8 @@ class HostMetadata:
 
     hostname: str = ""
     cloud_provider: str = "unknown"
-    instance_id: Optional[str] = None
-    k8s: Optional[K8sMetadata] = None
+    instance_id: str | None = None
+    k8s: K8sMetadata | None = None
 
     def to_dict(self) -> dict:
         """Convert to dictionary for API requests."""
@@ -51,7 +53,7 @@ def _is_running_in_kubernetes() -> bool:
     return os.path.exists("/var/run/secrets/kubernetes.io/serviceaccount/token")
 
 
-def _get_k8s_metadata() -> Optional[K8sMetadata]:
+def _get_k8s_metadata() -> K8sMetadata | None:
     """Get Kubernetes metadata from environment."""
     if not _is_running_in_kubernetes():
         return None
@@ -63,7 +65,7 @@ def _get_k8s_metadata() -> Optional[K8sMetadata]:
     )
 
 
-def _read_k8s_namespace() -> Optional[str]:
+def _read_k8s_namespace() -> str | None:
     """Read namespace from Kubernetes service account."""
     try:
         with open("/var/run/secrets/kubernetes.io/serviceaccount/namespace") as f:
@@ -72,54 +74,92 @@ def _read_k8s_namespace() -> Optional[str]:
         return None
 
 
-def _detect_aws() -> tuple[bool, Optional[str]]:
+def _detect_aws(client: httpx.Client) -> tuple[bool, str | None]:
     """Detect if running on AWS and get instance ID."""
     try:
         # Use IMDSv2
-        token_response = httpx.put(
+        token_response = client.put(
             "http://169.254.169.254/latest/api/token",
             headers={"X-aws-ec2-metadata-token-ttl-seconds": "21600"},
-            timeout=1.0,
         )
         token = token_response.text
 
-        instance_response = httpx.get(
+        instance_response = client.get(
             "http://169.254.169.254/latest/meta-data/instance-id",
             headers={"X-aws-ec2-metadata-token": token},
-            timeout=1.0,
         )
         return True, instance_response.text
     except Exception:
         return False, None
 
 
-def _detect_azure() -> tuple[bool, Optional[str]]:
+def _detect_azure(client: httpx.Client) -> tuple[bool, str | None]:
     """Detect if running on Azure and get instance ID."""
     try:
-        response = httpx.get(
+        response = client.get(
             "http://169.254.169.254/metadata/instance/compute/vmId",
             params={"api-version": "2021-02-01", "format": "text"},
             headers={"Metadata": "true"},
-            timeout=1.0,
         )
         return True, response.text
     except Exception:
         return False, None
 
 
-def _detect_gcp() -> tuple[bool, Optional[str]]:
+def _detect_gcp(client: httpx.Client) -> tuple[bool, str | None]:
     """Detect if running on GCP and get instance ID."""
     try:
-        response = httpx.get(
+        response = client.get(
             "http://metadata.google.internal/computeMetadata/v1/instance/id",
             headers={"Metadata-Flavor": "Google"},
-            timeout=1.0,
         )
         return True, response.text
     except Exception:
         return False, None
 
 
+# Cloud detectors in priority order
+_DETECTORS: dict[str, Callable[[httpx.Client], tuple[bool, str | None]]] = {
+    "aws": _detect_aws,
+    "azure": _detect_azure,
+    "gcp": _detect_gcp,
+}
+
+# Environment variables suggesting a cloud; they only order the metadata probes
+_CLOUD_ENV_HINTS = {
+    "aws": ("AWS_EXECUTION_ENV", "ECS_CONTAINER_METADATA_URI"),
+    "azure": ("WEBSITE_INSTANCE_ID",),
+    "gcp": ("GOOGLE_CLOUD_PROJECT", "GCE_METADATA_HOST"),
+}
+
+
+def _metadata_client() -> httpx.Client:
+    """
+    HTTP client shared by the metadata probes.
+
+    One client (and connection pool) serves every probe, so the AWS token
+    and instance-id requests reuse a connection. Probes are not retried.
+    """
+    return httpx.Client(timeout=1.0, transport=httpx.HTTPTransport(retries=0))
+
+
+def _candidate_clouds() -> list[str]:
+    """
+    Clouds to probe, in the order their results are trusted.
+
+    Clouds named by the environment come first, but every cloud is still
+    probed: hints such as ``GOOGLE_CLOUD_PROJECT`` are often set on hosts
+    outside that cloud, so a failed hinted probe falls through to the rest.
+    """
+    hinted = [
+        cloud
+        for cloud, variables in _CLOUD_ENV_HINTS.items()
+        if any(os.getenv(variable) for variable in variables)
+    ]
+    return hinted + [cloud for cloud in _DETECTORS if cloud not in hinted]
+
+
+@lru_cache(maxsize=1)
 def get_host_metadata() -> HostMetadata:
     """
     Collect metadata about the current host environment.
@@ -130,6 +170,10 @@ def get_host_metadata() -> HostMetadata:
     - Instance ID (for cloud VMs)
     - Kubernetes metadata (if running in K8s)
 
+    The result is cached for the life of the process. Metadata services
+    are probed concurrently, so an on-prem host waits for one probe
+    timeout rather than one per cloud.
+
     Returns:
         HostMetadata object with collected information
     """
@@ -141,23 +185,16 @@ def get_host_metadata() -> HostMetadata:
     metadata.k8s = _get_k8s_metadata()
 
     # Detect cloud provider
-    is_aws, aws_instance = _detect_aws()
-    if is_aws:
-        metadata.cloud_provider = "aws"
-        metadata.instance_id = aws_instance
-        return metadata
-
-    is_azure, azure_instance = _detect_azure()
-    if is_azure:
-        metadata.cloud_provider = "azure"
-        metadata.instance_id = azure_instance
-        return metadata
-
-    is_gcp, gcp_instance = _detect_gcp()
-    if is_gcp:
-        metadata.cloud_provider = "gcp"
-        metadata.instance_id = gcp_instance
-        return metadata
+    clouds = _candidate_clouds()
+    with _metadata_client() as client, ThreadPoolExecutor(max_workers=len(clouds)) as executor:
+        probes = {cloud: executor.submit(_DETECTORS[cloud], client) for cloud in clouds}
+
+    for cloud, probe in probes.items():
+        detected, instance_id = probe.result()
+        if detected:
+            metadata.cloud_provider = cloud
+            metadata.instance_id = instance_id
+            return metadata
 
     # On-prem or unknown
     metadata.cloud_provider = "on-prem"
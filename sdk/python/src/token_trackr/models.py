@@ -1,35 +1,36 @@
 """
 Data Models
 ===========
-Pydantic models for SDK data structures.
+Plain dataclasses for SDK data structures.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any
 
-from pydantic import BaseModel, Field
 
+@dataclass(slots=True)
+class UsageEvent:
+    """
+    Token usage event to send to the backend.
 
-class UsageEvent(BaseModel):
-    """Token usage event to send to the backend."""
+    Built locally from trusted wrapper values, so it is not validated here;
+    the backend validates every event it receives.
+    """
 
     tenant_id: str
     provider: str
     model: str
-    prompt_tokens: int = Field(ge=0)
-    completion_tokens: int = Field(ge=0)
+    prompt_tokens: int
+    completion_tokens: int
     timestamp: datetime
-    latency_ms: Optional[int] = Field(default=None, ge=0)
-    host: Optional[dict[str, Any]] = None
-    metadata: Optional[dict[str, Any]] = None
+    latency_ms: int | None = None
+    host: dict[str, Any] | None = None
+    metadata: dict[str, Any] | None = None
 
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
 
-
-class UsageResponse(BaseModel):
+@dataclass(slots=True)
+class UsageResponse:
     """Response from the backend after recording usage."""
 
     id: str
@@ -39,3 +40,18 @@ class UsageResponse(BaseModel):
     total_tokens: int
     calculated_cost: float
     timestamp: datetime
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "UsageResponse":
+        """Build a response from decoded backend JSON."""
+        return cls(
+            id=str(data["id"]),
+            tenant_id=data["tenant_id"],
+            provider=data["provider"],
+            model=data["model"],
+            total_tokens=int(data["total_tokens"]),
+            # Serialized as a decimal string by the backend
+            calculated_cost=float(data["calculated_cost"]),
+            # fromisoformat only accepts a "Z" suffix from Python 3.11
+            timestamp=datetime.fromisoformat(data["timestamp"].replace("Z", "+00:00")),
+        )
@@ -4,9 +4,12 @@ Azure OpenAI Wrapper
 Wrapper for Azure OpenAI client with automatic token tracking.
 """
 
+import asyncio
+import inspect
 import time
-from collections.abc import Iterator
-from typing import Any, Optional
+from collections.abc import AsyncIterator, Awaitable, Iterable, Iterator
+from contextlib import nullcontext
+from typing import Any
 
 from token_trackr.client import TokenTrackrClient, get_client
 
@@ -35,7 +38,7 @@ class AzureOpenAIWrapper:
     def __init__(
         self,
         azure_client: Any,
-        client: Optional[TokenTrackrClient] = None,
+        client: TokenTrackrClient | None = None,
     ):
         """
         Initialize the Azure OpenAI wrapper.
@@ -86,7 +89,10 @@ class _ChatCompletionsWrapper:
         """
         Create a chat completion with token tracking.
         """
-        start_time = time.time()
+        if not self._client.enabled:
+            return self._completions.create(model=model, messages=messages, stream=stream, **kwargs)
+
+        start_time = time.perf_counter_ns()
 
         response = self._completions.create(
             model=model,
@@ -95,6 +101,57 @@ class _ChatCompletionsWrapper:
             **kwargs,
         )
 
+        # AsyncAzureOpenAI returns a coroutine; track it once awaited
+        if inspect.isawaitable(response):
+            return self._track_async(response, model, stream, start_time)
+
+        return self._track(response, model, stream, start_time)
+
+    async def create_many(
+        self,
+        model: str,
+        messages_list: Iterable[list[dict[str, Any]]],
+        max_concurrency: int | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """
+        Create several chat completions concurrently, tracking each call.
+
+        Requires an async client (``AsyncAzureOpenAI``).
+
+        Args:
+            model: The deployment name
+            messages_list: Message lists, one per completion
+            max_concurrency: Limit on in-flight requests (unlimited if None)
+            **kwargs: Additional arguments for create
+
+        Returns:
+            The completions, in input order
+        """
+        # Checked up front so a sync client never sends any request; openai wraps
+        # create in a sync decorator, so look through it to the async function
+        if not inspect.iscoroutinefunction(inspect.unwrap(self._completions.create)):
+            raise TypeError("create_many requires an async Azure OpenAI client")
+
+        limit = asyncio.Semaphore(max_concurrency) if max_concurrency else nullcontext()
+
+        async def _create(messages: list[dict[str, Any]]) -> Any:
+            async with limit:
+                return await self.create(model=model, messages=messages, **kwargs)
+
+        return await asyncio.gather(*(_create(messages) for messages in messages_list))
+
+    async def _track_async(
+        self,
+        response: Awaitable[Any],
+        model: str,
+        stream: bool,
+        start_time: int,
+    ) -> Any:
+        return self._track(await response, model, stream, start_time)
+
+    def _track(self, response: Any, model: str, stream: bool, start_time: int) -> Any:
+        """Record usage for a completed response, or wrap a stream."""
         if stream:
             return _StreamingChatWrapper(
                 response=response,
@@ -103,13 +160,15 @@ class _ChatCompletionsWrapper:
                 start_time=start_time,
             )
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         # Extract token usage
         usage = response.usage
         prompt_tokens = usage.prompt_tokens if usage else 0
         completion_tokens = usage.completion_tokens if usage else 0
 
+        choices = response.choices
+
         # Record usage
         self._client.record(
             provider="azure_openai",
@@ -119,7 +178,7 @@ class _ChatCompletionsWrapper:
             latency_ms=latency_ms,
             metadata={
                 "id": response.id,
-                "finish_reason": response.choices[0].finish_reason if response.choices else None,
+                "finish_reason": choices[0].finish_reason if choices else None,
             },
         )
 
@@ -130,16 +189,21 @@ class _ChatCompletionsWrapper:
 
 
 class _StreamingChatWrapper:
-    """Wrapper for streaming chat responses."""
+    """Wrapper for sync and async streaming chat responses."""
 
     def __init__(
         self,
-        response: Iterator[Any],
+        response: Iterator[Any] | AsyncIterator[Any],
         model: str,
         client: TokenTrackrClient,
-        start_time: float,
+        start_time: int,
     ):
         self._response = response
+        # Bound once; __next__/__anext__ run per streamed chunk
+        if hasattr(response, "__aiter__"):
+            self._anext = aiter(response).__anext__
+        else:
+            self._next = iter(response).__next__
         self._model = model
         self._client = client
         self._start_time = start_time
@@ -151,27 +215,39 @@ class _StreamingChatWrapper:
 
     def __next__(self):
         try:
-            chunk = next(self._response)
-
-            # Track usage from stream options (if available)
-            if hasattr(chunk, "usage") and chunk.usage:
-                self._prompt_tokens = chunk.usage.prompt_tokens or 0
-                self._completion_tokens = chunk.usage.completion_tokens or 0
+            return self._track_chunk(self._next())
+        except StopIteration:
+            self._record()
+            raise
 
-            return chunk
+    def __aiter__(self):
+        return self
 
-        except StopIteration:
-            # Record usage when stream ends
-            latency_ms = int((time.time() - self._start_time) * 1000)
-            self._client.record(
-                provider="azure_openai",
-                model=self._model,
-                prompt_tokens=self._prompt_tokens,
-                completion_tokens=self._completion_tokens,
-                latency_ms=latency_ms,
-            )
+    async def __anext__(self):
+        try:
+            return self._track_chunk(await self._anext())
+        except StopAsyncIteration:
+            self._record()
             raise
 
+    def _track_chunk(self, chunk: Any) -> Any:
+        # Track usage from stream options (if available)
+        if hasattr(chunk, "usage") and chunk.usage:
+            self._prompt_tokens = chunk.usage.prompt_tokens or 0
+            self._completion_tokens = chunk.usage.completion_tokens or 0
+        return chunk
+
+    def _record(self) -> None:
+        """Record usage when the stream ends."""
+        latency_ms = (time.perf_counter_ns() - self._start_time) // 1_000_000
+        self._client.record(
+            provider="azure_openai",
+            model=self._model,
+            prompt_tokens=self._prompt_tokens,
+            completion_tokens=self._completion_tokens,
+            latency_ms=latency_ms,
+        )
+
 
 class _CompletionsWrapper:
     """Wrapper for legacy completions."""
@@ -181,7 +257,10 @@ class _CompletionsWrapper:
         self._client = client
 
     def create(self, model: str, prompt: str, **kwargs: Any) -> Any:
-        start_time = time.time()
+        if not self._client.enabled:
+            return self._completions.create(model=model, prompt=prompt, **kwargs)
+
+        start_time = time.perf_counter_ns()
 
         response = self._completions.create(
             model=model,
@@ -189,7 +268,7 @@ class _CompletionsWrapper:
             **kwargs,
         )
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         usage = response.usage
         self._client.record(
@@ -214,7 +293,10 @@ class _EmbeddingsWrapper:
         self._client = client
 
     def create(self, model: str, input: str | list[str], **kwargs: Any) -> Any:
-        start_time = time.time()
+        if not self._client.enabled:
+            return self._embeddings.create(model=model, input=input, **kwargs)
+
+        start_time = time.perf_counter_ns()
 
         response = self._embeddings.create(
             model=model,
@@ -222,7 +304,7 @@ class _EmbeddingsWrapper:
             **kwargs,
         )
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         usage = response.usage
         self._client.record(
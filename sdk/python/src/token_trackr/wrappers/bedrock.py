@@ -4,13 +4,75 @@ AWS Bedrock Wrapper
 Wrapper for AWS Bedrock client with automatic token tracking.
 """
 
-import json
 import time
-from typing import Any, Optional
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any
+
+import orjson
 
 from token_trackr.client import TokenTrackrClient, get_client
 
 
+def _extract_anthropic(body: dict[str, Any]) -> tuple[int, int]:
+    usage = body.get("usage", {})
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+
+def _extract_titan(body: dict[str, Any]) -> tuple[int, int]:
+    return (
+        body.get("inputTextTokenCount", 0),
+        body.get("results", [{}])[0].get("tokenCount", 0),
+    )
+
+
+def _extract_llama(body: dict[str, Any]) -> tuple[int, int]:
+    return body.get("prompt_token_count", 0), body.get("generation_token_count", 0)
+
+
+def _extract_cohere(body: dict[str, Any]) -> tuple[int, int]:
+    meta = body.get("meta", {}).get("billed_units", {})
+    return meta.get("input_tokens", 0), meta.get("output_tokens", 0)
+
+
+def _extract_openai_style(body: dict[str, Any]) -> tuple[int, int]:
+    usage = body.get("usage", {})
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def _extract_default(body: dict[str, Any]) -> tuple[int, int]:
+    return 0, 0
+
+
+# Bedrock appends these to the last chunk of every stream, whatever the model
+_METRICS_KEY = b'"amazon-bedrock-invocationMetrics"'
+
+# Keyed by the vendor segment of the model id ("anthropic.claude-3-..." -> "anthropic")
+_EXTRACTORS: dict[str, Callable[[dict[str, Any]], tuple[int, int]]] = {
+    "anthropic": _extract_anthropic,
+    "amazon": _extract_titan,
+    "meta": _extract_llama,
+    "cohere": _extract_cohere,
+    "mistral": _extract_openai_style,
+    "ai21": _extract_openai_style,
+}
+
+
+@lru_cache(maxsize=64)
+def _resolve_extractor(model_id: str) -> Callable[[dict[str, Any]], tuple[int, int]]:
+    """Return the token extractor for a Bedrock model id (cached per id)."""
+    model_id = model_id.lower()
+    segments = model_id.split(".", 2)
+    if segments[0] in _EXTRACTORS:
+        return _EXTRACTORS[segments[0]]
+    # Cross-region inference profiles prefix the id with a region ("us.anthropic...")
+    if len(segments) > 1 and segments[1] in _EXTRACTORS:
+        return _EXTRACTORS[segments[1]]
+    # ARNs and other identifiers: fall back to a substring scan
+    vendor = next((vendor for vendor in _EXTRACTORS if vendor in model_id), None)
+    return _EXTRACTORS[vendor] if vendor else _extract_default
+
+
 class BedrockWrapper:
     """
     Wrapper for AWS Bedrock client that automatically tracks token usage.
@@ -34,7 +96,7 @@ class BedrockWrapper:
     def __init__(
         self,
         bedrock_client: Any,
-        client: Optional[TokenTrackrClient] = None,
+        client: TokenTrackrClient | None = None,
     ):
         """
         Initialize the Bedrock wrapper.
@@ -63,7 +125,11 @@ class BedrockWrapper:
         Returns:
             The model response
         """
-        start_time = time.time()
+        if not self._client.enabled:
+            response = self._bedrock.invoke_model(modelId=modelId, body=body, **kwargs)
+            return orjson.loads(response["body"].read())
+
+        start_time = time.perf_counter_ns()
 
         # Call the actual Bedrock API
         response = self._bedrock.invoke_model(
@@ -72,10 +138,10 @@ class BedrockWrapper:
             **kwargs,
         )
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         # Parse response body
-        response_body = json.loads(response["body"].read())
+        response_body = orjson.loads(response["body"].read())
 
         # Extract token counts based on model family
         prompt_tokens, completion_tokens = self._extract_tokens(modelId, response_body, response)
@@ -98,14 +164,22 @@ class BedrockWrapper:
         self,
         modelId: str,
         body: str | bytes,
+        raw_chunks: bool = False,
         **kwargs: Any,
     ) -> Any:
         """
         Invoke a Bedrock model with streaming and token tracking.
 
         Note: Token counts are extracted after streaming completes.
+
+        Args:
+            modelId: The model identifier
+            body: Request body (JSON string or bytes)
+            raw_chunks: Yield the raw stream events instead of decoded chunk
+                dicts; only the chunk carrying invocation metrics is parsed
+            **kwargs: Additional arguments for invoke_model_with_response_stream
         """
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         response = self._bedrock.invoke_model_with_response_stream(
             modelId=modelId,
@@ -119,6 +193,7 @@ class BedrockWrapper:
             model_id=modelId,
             client=self._client,
             start_time=start_time,
+            raw_chunks=raw_chunks,
         )
 
     def _extract_tokens(
@@ -128,54 +203,7 @@ class BedrockWrapper:
         response: dict[str, Any],
     ) -> tuple[int, int]:
         """Extract token counts from response based on model family."""
-        # Anthropic Claude models
-        if "anthropic" in model_id.lower():
-            usage = response_body.get("usage", {})
-            return (
-                usage.get("input_tokens", 0),
-                usage.get("output_tokens", 0),
-            )
-
-        # Amazon Titan models
-        if "amazon.titan" in model_id.lower():
-            return (
-                response_body.get("inputTextTokenCount", 0),
-                response_body.get("results", [{}])[0].get("tokenCount", 0),
-            )
-
-        # Meta Llama models
-        if "meta.llama" in model_id.lower():
-            return (
-                response_body.get("prompt_token_count", 0),
-                response_body.get("generation_token_count", 0),
-            )
-
-        # Cohere models
-        if "cohere" in model_id.lower():
-            meta = response_body.get("meta", {}).get("billed_units", {})
-            return (
-                meta.get("input_tokens", 0),
-                meta.get("output_tokens", 0),
-            )
-
-        # Mistral models
-        if "mistral" in model_id.lower():
-            usage = response_body.get("usage", {})
-            return (
-                usage.get("prompt_tokens", 0),
-                usage.get("completion_tokens", 0),
-            )
-
-        # AI21 models
-        if "ai21" in model_id.lower():
-            usage = response_body.get("usage", {})
-            return (
-                usage.get("prompt_tokens", 0),
-                usage.get("completion_tokens", 0),
-            )
-
-        # Default fallback
-        return (0, 0)
+        return _resolve_extractor(model_id)(response_body)
 
     def __getattr__(self, name: str) -> Any:
         """Delegate unknown attributes to the underlying Bedrock client."""
@@ -190,40 +218,43 @@ class _StreamingResponseWrapper:
         response: Any,
         model_id: str,
         client: TokenTrackrClient,
-        start_time: float,
+        start_time: int,
+        raw_chunks: bool = False,
     ):
         self._response = response
+        self._raw_chunks = raw_chunks
+        # Bound once; __next__ runs per streamed chunk
+        self._next = iter(response["body"]).__next__
         self._model_id = model_id
         self._client = client
         self._start_time = start_time
         self._prompt_tokens = 0
         self._completion_tokens = 0
-        self._chunks: list[dict] = []
 
     def __iter__(self):
         return self
 
     def __next__(self):
         try:
-            event = next(self._response["body"])
+            event = self._next()
 
-            if "chunk" in event:
-                chunk_data = json.loads(event["chunk"]["bytes"])
-                self._chunks.append(chunk_data)
+            if "chunk" not in event:
+                return event
 
-                # Extract final token counts from message_stop event
-                if chunk_data.get("type") == "message_stop":
-                    usage = chunk_data.get("amazon-bedrock-invocationMetrics", {})
-                    self._prompt_tokens = usage.get("inputTokenCount", 0)
-                    self._completion_tokens = usage.get("outputTokenCount", 0)
+            raw = event["chunk"]["bytes"]
+            if self._raw_chunks:
+                # Only the final chunk carries metrics; skip decoding the rest
+                if _METRICS_KEY in raw:
+                    self._track_metrics(orjson.loads(raw))
+                return event
 
-                return chunk_data
-
-            return event
+            chunk_data = orjson.loads(raw)
+            self._track_metrics(chunk_data)
+            return chunk_data
 
         except StopIteration:
             # Record usage when stream ends
-            latency_ms = int((time.time() - self._start_time) * 1000)
+            latency_ms = (time.perf_counter_ns() - self._start_time) // 1_000_000
             self._client.record(
                 provider="bedrock",
                 model=self._model_id,
@@ -232,3 +263,10 @@ class _StreamingResponseWrapper:
                 latency_ms=latency_ms,
             )
             raise
+
+    def _track_metrics(self, chunk_data: dict[str, Any]) -> None:
+        """Take final token counts from the invocation metrics, if present."""
+        usage = chunk_data.get("amazon-bedrock-invocationMetrics")
+        if usage:
+            self._prompt_tokens = usage.get("inputTokenCount", 0)
+            self._completion_tokens = usage.get("outputTokenCount", 0)
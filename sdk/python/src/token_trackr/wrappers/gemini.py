@@ -4,13 +4,26 @@ Google Gemini Wrapper
 Wrapper for Google Gemini client with automatic token tracking.
 """
 
+import asyncio
 import time
-from collections.abc import Iterator
-from typing import Any, Optional
+from collections.abc import AsyncIterable, Iterable
+from contextlib import nullcontext
+from typing import Any
 
 from token_trackr.client import TokenTrackrClient, get_client
 
 
+def _usage_tokens(response: Any) -> tuple[int, int] | None:
+    """Return (prompt, completion) tokens from usage metadata, if present."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return None
+    return (
+        getattr(usage, "prompt_token_count", 0),
+        getattr(usage, "candidates_token_count", 0),
+    )
+
+
 class GeminiWrapper:
     """
     Wrapper for Google Gemini client that automatically tracks token usage.
@@ -29,7 +42,7 @@ class GeminiWrapper:
     def __init__(
         self,
         model: Any,
-        client: Optional[TokenTrackrClient] = None,
+        client: TokenTrackrClient | None = None,
     ):
         """
         Initialize the Gemini wrapper.
@@ -59,7 +72,10 @@ class GeminiWrapper:
         Returns:
             The model response
         """
-        start_time = time.time()
+        if not self._client.enabled:
+            return self._model.generate_content(contents, stream=stream, **kwargs)
+
+        start_time = time.perf_counter_ns()
 
         if stream:
             response = self._model.generate_content(
@@ -76,7 +92,7 @@ class GeminiWrapper:
 
         response = self._model.generate_content(contents, **kwargs)
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
         # Extract token usage
         prompt_tokens, completion_tokens = self._extract_tokens(response)
@@ -95,34 +111,74 @@ class GeminiWrapper:
 
         return response
 
-    def generate_content_async(
+    async def generate_content_async(
         self,
         contents: Any,
+        stream: bool = False,
         **kwargs: Any,
     ) -> Any:
         """
         Async content generation with token tracking.
+
+        With ``stream=True`` the returned response supports ``async for``.
         """
+        if not self._client.enabled:
+            return await self._model.generate_content_async(contents, stream=stream, **kwargs)
 
-        async def _generate():
-            start_time = time.time()
+        start_time = time.perf_counter_ns()
 
-            response = await self._model.generate_content_async(contents, **kwargs)
+        if stream:
+            response = await self._model.generate_content_async(
+                contents,
+                stream=True,
+                **kwargs,
+            )
+            return _StreamingGeminiWrapper(
+                response=response,
+                model_name=self._model_name,
+                client=self._client,
+                start_time=start_time,
+            )
 
-            latency_ms = int((time.time() - start_time) * 1000)
-            prompt_tokens, completion_tokens = self._extract_tokens(response)
+        response = await self._model.generate_content_async(contents, **kwargs)
 
-            self._client.record(
-                provider="gemini",
-                model=self._model_name,
-                prompt_tokens=prompt_tokens,
-                completion_tokens=completion_tokens,
-                latency_ms=latency_ms,
-            )
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
+        prompt_tokens, completion_tokens = self._extract_tokens(response)
+
+        self._client.record(
+            provider="gemini",
+            model=self._model_name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency_ms=latency_ms,
+        )
+
+        return response
 
-            return response
+    async def generate_many(
+        self,
+        contents_list: Iterable[Any],
+        max_concurrency: int | None = None,
+        **kwargs: Any,
+    ) -> list[Any]:
+        """
+        Generate content for several inputs concurrently, tracking each call.
+
+        Args:
+            contents_list: Inputs, one per generate_content_async call
+            max_concurrency: Limit on in-flight requests (unlimited if None)
+            **kwargs: Additional arguments for generate_content_async
+
+        Returns:
+            The responses, in input order
+        """
+        limit = asyncio.Semaphore(max_concurrency) if max_concurrency else nullcontext()
 
-        return _generate()
+        async def _generate(contents: Any) -> Any:
+            async with limit:
+                return await self.generate_content_async(contents, **kwargs)
+
+        return await asyncio.gather(*(_generate(contents) for contents in contents_list))
 
     def count_tokens(self, contents: Any) -> Any:
         """
@@ -143,23 +199,15 @@ class GeminiWrapper:
 
     def _extract_tokens(self, response: Any) -> tuple[int, int]:
         """Extract token counts from response."""
-        try:
-            usage = response.usage_metadata
-            return (
-                usage.prompt_token_count,
-                usage.candidates_token_count,
-            )
-        except AttributeError:
-            return (0, 0)
+        return _usage_tokens(response) or (0, 0)
 
-    def _get_finish_reason(self, response: Any) -> Optional[str]:
+    def _get_finish_reason(self, response: Any) -> str | None:
         """Get finish reason from response."""
-        try:
-            if response.candidates:
-                return str(response.candidates[0].finish_reason)
-        except Exception:
-            pass
-        return None
+        candidates = getattr(response, "candidates", None)
+        if not candidates:
+            return None
+        finish_reason = getattr(candidates[0], "finish_reason", None)
+        return None if finish_reason is None else str(finish_reason)
 
     def __getattr__(self, name: str) -> Any:
         """Delegate unknown attributes to the underlying model."""
@@ -167,53 +215,65 @@ class GeminiWrapper:
 
 
 class _StreamingGeminiWrapper:
-    """Wrapper for streaming Gemini responses."""
+    """Wrapper for sync and async streaming Gemini responses."""
 
     def __init__(
         self,
-        response: Iterator[Any],
+        response: Iterable[Any] | AsyncIterable[Any],
         model_name: str,
         client: TokenTrackrClient,
-        start_time: float,
+        start_time: int,
     ):
         self._response = response
+        # Bound once; __next__/__anext__ run per streamed chunk
+        if hasattr(response, "__aiter__"):
+            self._anext = aiter(response).__anext__
+        else:
+            self._next = iter(response).__next__
         self._model_name = model_name
         self._client = client
         self._start_time = start_time
         self._prompt_tokens = 0
         self._completion_tokens = 0
-        self._chunks: list[Any] = []
 
     def __iter__(self):
         return self
 
     def __next__(self):
         try:
-            chunk = next(self._response)
-            self._chunks.append(chunk)
-
-            # Update token counts from usage metadata
-            try:
-                usage = chunk.usage_metadata
-                self._prompt_tokens = usage.prompt_token_count
-                self._completion_tokens = usage.candidates_token_count
-            except AttributeError:
-                pass
+            return self._track_chunk(self._next())
+        except StopIteration:
+            self._record()
+            raise
 
-            return chunk
+    def __aiter__(self):
+        return self
 
-        except StopIteration:
-            # Record usage when stream ends
-            latency_ms = int((time.time() - self._start_time) * 1000)
-            self._client.record(
-                provider="gemini",
-                model=self._model_name,
-                prompt_tokens=self._prompt_tokens,
-                completion_tokens=self._completion_tokens,
-                latency_ms=latency_ms,
-            )
+    async def __anext__(self):
+        try:
+            return self._track_chunk(await self._anext())
+        except StopAsyncIteration:
+            self._record()
             raise
 
+    def _track_chunk(self, chunk: Any) -> Any:
+        # Update token counts from usage metadata
+        tokens = _usage_tokens(chunk)
+        if tokens:
+            self._prompt_tokens, self._completion_tokens = tokens
+        return chunk
+
+    def _record(self) -> None:
+        """Record usage when the stream ends."""
+        latency_ms = (time.perf_counter_ns() - self._start_time) // 1_000_000
+        self._client.record(
+            provider="gemini",
+            model=self._model_name,
+            prompt_tokens=self._prompt_tokens,
+            completion_tokens=self._completion_tokens,
+            latency_ms=latency_ms,
+        )
+
 
 class _ChatSessionWrapper:
     """Wrapper for Gemini chat sessions."""
@@ -235,7 +295,10 @@ class _ChatSessionWrapper:
         **kwargs: Any,
     ) -> Any:
         """Send a message with token tracking."""
-        start_time = time.time()
+        if not self._client.enabled:
+            return self._chat.send_message(content, stream=stream, **kwargs)
+
+        start_time = time.perf_counter_ns()
 
         if stream:
             response = self._chat.send_message(content, stream=True, **kwargs)
@@ -248,15 +311,9 @@ class _ChatSessionWrapper:
 
         response = self._chat.send_message(content, **kwargs)
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        latency_ms = (time.perf_counter_ns() - start_time) // 1_000_000
 
-        try:
-            usage = response.usage_metadata
-            prompt_tokens = usage.prompt_token_count
-            completion_tokens = usage.candidates_token_count
-        except AttributeError:
-            prompt_tokens = 0
-            completion_tokens = 0
+        prompt_tokens, completion_tokens = _usage_tokens(response) or (0, 0)
 
         self._client.record(
             provider="gemini",
@@ -6,11 +6,12 @@ Pytest fixtures for Token Trackr tests.
 
 import asyncio
 from collections.abc import AsyncGenerator, Generator
-from datetime import datetime
+from datetime import datetime, timezone
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from backend.database import get_session
 from backend.main import app
@@ -31,7 +32,13 @@ def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
 @pytest.fixture(scope="session")
 async def test_engine():
     """Create test database engine."""
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    # One connection for every session, so all tests share the same in-memory database
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -41,31 +48,41 @@ async def test_engine():
     await engine.dispose()
 
 
-@pytest.fixture
-async def test_session(test_engine) -> AsyncGenerator[AsyncSession, None]:
-    """Create test database session."""
-    async_session = async_sessionmaker(
+@pytest.fixture(scope="session")
+def test_session_factory(test_engine) -> async_sessionmaker[AsyncSession]:
+    """Create the session factory shared by all tests."""
+    return async_sessionmaker(
         test_engine,
         class_=AsyncSession,
         expire_on_commit=False,
     )
 
-    async with async_session() as session:
+
+@pytest.fixture
+async def test_session(test_session_factory) -> AsyncGenerator[AsyncSession, None]:
+    """Create test database session."""
+    async with test_session_factory() as session:
         yield session
         await session.rollback()
 
 
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """Start the application once for the whole test session."""
+    with TestClient(app) as c:
+        yield c
+
+
 @pytest.fixture
-def client(test_session) -> Generator[TestClient, None, None]:
-    """Create test client with database session override."""
+def client(app_client, test_session) -> Generator[TestClient, None, None]:
+    """Provide the shared test client with a per-test database session override."""
 
     async def override_get_session():
         yield test_session
 
     app.dependency_overrides[get_session] = override_get_session
 
-    with TestClient(app) as c:
-        yield c
+    yield app_client
 
     app.dependency_overrides.clear()
 
@@ -73,13 +90,14 @@ def client(test_session) -> Generator[TestClient, None, None]:
 @pytest.fixture
 def sample_usage_event() -> dict:
     """Sample usage event for testing."""
+    timestamp = datetime.now(timezone.utc).isoformat()
     return {
         "tenant_id": "test-tenant",
         "provider": "bedrock",
         "model": "anthropic.claude-3-sonnet-20240229-v1:0",
         "prompt_tokens": 100,
         "completion_tokens": 50,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": timestamp,
         "latency_ms": 1500,
         "host": {
             "hostname": "test-host",
@@ -96,6 +114,7 @@ def sample_usage_event() -> dict:
 @pytest.fixture
 def sample_batch_events() -> list[dict]:
     """Sample batch of usage events for testing."""
+    timestamp = datetime.now(timezone.utc).isoformat()
     return [
         {
             "tenant_id": "test-tenant",
@@ -103,7 +122,7 @@ def sample_batch_events() -> list[dict]:
             "model": "anthropic.claude-3-sonnet-20240229-v1:0",
             "prompt_tokens": 100,
             "completion_tokens": 50,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
         },
         {
             "tenant_id": "test-tenant",
@@ -111,7 +130,7 @@ def sample_batch_events() -> list[dict]:
             "model": "gpt-4o",
             "prompt_tokens": 200,
             "completion_tokens": 100,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
         },
         {
             "tenant_id": "test-tenant",
@@ -119,6 +138,6 @@ def sample_batch_events() -> list[dict]:
             "model": "gemini-1.5-pro",
             "prompt_tokens": 150,
             "completion_tokens": 75,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp,
         },
     ]
@@ -6,6 +6,9 @@ Tests for Token Trackr REST API endpoints.
 
 from fastapi.testclient import TestClient
 
+from backend.api.endpoints import tenants
+from backend.services.usage import UsageService
+
 
 class TestHealthEndpoints:
     """Tests for health check endpoints."""
@@ -35,7 +38,8 @@ class TestUsageEndpoints:
             data["total_tokens"]
             == sample_usage_event["prompt_tokens"] + sample_usage_event["completion_tokens"]
         )
-        assert "calculated_cost" in data
+        # Decimal costs are serialized as strings, not floats
+        assert isinstance(data["calculated_cost"], str)
         assert "id" in data
 
     def test_record_usage_invalid_provider(self, client: TestClient, sample_usage_event: dict):
@@ -60,6 +64,28 @@ class TestUsageEndpoints:
             assert "id" in item
             assert "calculated_cost" in item
 
+    def test_record_batch_usage_bulk_failure_falls_back(
+        self, client: TestClient, sample_batch_events: list[dict], monkeypatch
+    ):
+        """Test a failed bulk write still records the events one by one."""
+
+        async def fail(self, events):
+            raise RuntimeError("bulk insert failed")
+
+        monkeypatch.setattr(UsageService, "record_usage_many", fail)
+        response = client.post("/usage/batch", json=sample_batch_events)
+        assert response.status_code == 201
+        assert len(response.json()) == len(sample_batch_events)
+
+    def test_record_batch_usage_invalid_event(
+        self, client: TestClient, sample_batch_events: list[dict]
+    ):
+        """Test batch validation errors point at the offending event."""
+        sample_batch_events[1]["provider"] = "invalid_provider"
+        response = client.post("/usage/batch", json=sample_batch_events)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", 1, "provider"]
+
 
 class TestTenantEndpoints:
     """Tests for tenant reporting endpoints."""
@@ -74,8 +100,36 @@ class TestTenantEndpoints:
         assert data["total_requests"] == 0
         assert data["total_tokens"] == 0
 
-    def test_get_daily_summary(self, client: TestClient):
+    def test_get_tenant_summary_breakdowns(
+        self, client: TestClient, sample_batch_events: list[dict]
+    ):
+        """Test summary totals and per-dimension breakdowns."""
+        for event in sample_batch_events:
+            event["tenant_id"] = "summary-tenant"
+        client.post("/usage/batch", json=sample_batch_events)
+
+        response = client.get("/tenant/summary-tenant/summary")
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["total_requests"] == 3
+        assert data["total_tokens"] == 675
+        assert set(data["by_provider"]) == {"bedrock", "azure_openai", "gemini"}
+        assert data["by_model"]["gpt-4o"]["tokens"] == 300
+        assert data["by_cloud_provider"]["unknown"]["requests"] == 3
+
+    def test_get_daily_summary(self, client: TestClient, monkeypatch):
         """Test getting daily summary."""
+        calls = []
+        get_daily_summary = UsageService.get_daily_summary
+
+        async def counted(self, *args, **kwargs):
+            calls.append(args)
+            return await get_daily_summary(self, *args, **kwargs)
+
+        monkeypatch.setattr(UsageService, "get_daily_summary", counted)
+        monkeypatch.setattr(tenants, "_summary_cache", {})
+
         response = client.get("/tenant/test-tenant/daily")
         assert response.status_code == 200
         data = response.json()
@@ -85,6 +139,10 @@ class TestTenantEndpoints:
         assert "start_date" in data
         assert "end_date" in data
 
+        # A repeat request within the cache TTL is served without querying again
+        assert client.get("/tenant/test-tenant/daily").json() == data
+        assert len(calls) == 1
+
     def test_get_monthly_summary(self, client: TestClient):
         """Test getting monthly summary."""
         response = client.get("/tenant/test-tenant/monthly")
@@ -127,3 +185,12 @@ class TestProviderEndpoints:
         """Test getting models for invalid provider."""
         response = client.get("/provider/invalid/models")
         assert response.status_code == 400
+
+    def test_get_models_not_modified(self, client: TestClient):
+        """Test conditional request with a matching ETag."""
+        response = client.get("/provider/bedrock/models")
+        etag = response.headers["etag"]
+
+        response = client.get("/provider/bedrock/models", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
@@ -6,19 +6,21 @@ Tests for the token cost calculation engine.
 
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from backend.core.pricing import PricingEngine
 
 
+@pytest.fixture(scope="module")
+def engine() -> PricingEngine:
+    """Create a pricing engine with default config, shared by the module."""
+    return PricingEngine()
+
+
 class TestPricingEngine:
     """Tests for the pricing engine."""
 
-    @pytest.fixture
-    def engine(self) -> PricingEngine:
-        """Create a pricing engine with default config."""
-        return PricingEngine()
-
     def test_bedrock_cost_calculation(self, engine: PricingEngine):
         """Test cost calculation for Bedrock models."""
         cost = engine.bedrock_cost(
@@ -108,3 +110,33 @@ class TestPricingEngine:
             assert "model" in model
             assert "input_price_per_1k" in model
             assert "output_price_per_1k" in model
+
+    def test_calculate_cost_batch_matches_scalar(self, engine: PricingEngine):
+        """Test that vectorized pricing agrees with calculate_cost."""
+        keys = [("bedrock", "anthropic.claude-3-sonnet-20240229-v1:0", None), ("gemini", "x", None)]
+        events = [(0, 1000, 500), (1, 200, 100), (0, 0, 0)]
+
+        costs = engine.calculate_cost_batch(
+            np.array([e[1] for e in events], dtype=np.float64),
+            np.array([e[2] for e in events], dtype=np.float64),
+            np.array([e[0] for e in events]),
+            engine.get_rate_table(keys),
+        )
+
+        for (idx, prompt, completion), cost in zip(events, costs.tolist(), strict=True):
+            provider, model, _ = keys[idx]
+            expected = engine.calculate_cost(provider, model, prompt, completion)
+            assert Decimal(repr(cost)).quantize(Decimal("0.0000000001")) == expected
+
+    def test_calculate_cost_many_matches_scalar(self, engine: PricingEngine):
+        """Test that batch pricing returns exactly what calculate_cost does."""
+        items = [
+            ("bedrock", "anthropic.claude-3-sonnet-20240229-v1:0", 1000, 500, "t1"),
+            ("gemini", "gemini-1.5-pro", 200, 100, None),
+            ("bedrock", "anthropic.claude-3-sonnet-20240229-v1:0", 7, 3, "t1"),
+        ]
+
+        costs = engine.calculate_cost_many(items)
+
+        assert costs == [engine.calculate_cost(*item) for item in items]
+        assert engine.calculate_cost_many([]) == []